@@ -2,7 +2,8 @@
 API依赖 - 定义API路由需要的依赖
 统一的依赖注入入口，避免重复定义
 """
-from typing import Dict, Any, Optional, TypeVar
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Any, Iterator, Optional, TypeVar
 from datetime import datetime
 import random
 
@@ -10,8 +11,9 @@ from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.security import verify_api_key, decode_token
+from ..core.security import verify_api_key, decode_token_cached
 from ..core.config import get_settings
+from ..core.context import current_user_var
 from ..core.database import get_session
 from ..core.logging import get_logger
 from ..domain.schemas.base import ApiResponse
@@ -72,39 +74,53 @@ async def get_user_service(session: AsyncSession = Depends(get_session)) -> User
     """获取用户服务"""
     return UserService(session)
 
+@contextmanager
+def _current_user_scope(user: Optional[User]) -> Iterator[None]:
+    """在依赖的生命周期内把当前用户写入上下文变量，退出时恢复原值"""
+    token = current_user_var.set(user)
+    try:
+        yield
+    finally:
+        current_user_var.reset(token)
+
 async def get_optional_current_user(
     authorization: Optional[str] = Header(None, alias="Authorization"),
     user_service: UserService = Depends(get_user_service)
-) -> Optional[User]:
+) -> AsyncIterator[Optional[User]]:
     """获取可选的当前用户，不抛出异常"""
-    logger.info(f"get_optional_current_user called with authorization: {authorization is not None}")
+    user = await _load_optional_user(authorization, user_service)
+    with _current_user_scope(user):
+        yield user
+
+async def _load_optional_user(authorization: Optional[str], user_service: UserService) -> Optional[User]:
+    """解析Authorization头中的用户，任何失败都返回None"""
+    logger.debug("get_optional_current_user called with authorization: %s", authorization is not None)
     
     if authorization is None:
-        logger.info("No authorization header provided, returning None")
+        logger.debug("No authorization header provided, returning None")
         return None
     
     # 提取Bearer token
     if not authorization.startswith("Bearer "):
-        logger.info("Authorization header does not start with 'Bearer ', returning None")
+        logger.debug("Authorization header does not start with 'Bearer ', returning None")
         return None
     
     token = authorization[7:]  # 移除 "Bearer " 前缀
     
     try:
-        token_data = decode_token(token)
+        token_data = decode_token_cached(token)
         if token_data is None:
-            logger.info("Token data is None, returning None")
+            logger.debug("Token data is None, returning None")
             return None
         
-        user = await user_service.get_user_by_username(token_data.username)
-        return user
+        return await user_service.get_user_by_username(token_data.username)
     except HTTPException as e:
         # 捕获decode_token可能抛出的HTTPException，返回None而不是传播异常
-        logger.info(f"HTTPException caught in get_optional_current_user: {e.detail}")
+        logger.debug("HTTPException caught in get_optional_current_user: %s", e.detail)
         return None
     except Exception as e:
         # 捕获其他可能的异常
-        logger.info(f"Other exception caught in get_optional_current_user: {str(e)}")
+        logger.debug("Other exception caught in get_optional_current_user: %s", e)
         return None
 
 async def get_knowledge_service(session: AsyncSession = Depends(get_session)) -> KnowledgeService:
@@ -139,7 +155,7 @@ async def get_user_llm_config_service(session: AsyncSession = Depends(get_sessio
 async def get_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
     user_service: UserService = Depends(get_user_service)
-) -> User:
+) -> AsyncIterator[User]:
     """获取当前用户"""
     if token is None:
         raise HTTPException(
@@ -148,7 +164,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    token_data = decode_token(token)
+    token_data = decode_token_cached(token)
     if token_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -164,7 +180,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    return user
+    with _current_user_scope(user):
+        yield user
 
 async def get_current_admin(
     current_user: User = Depends(get_current_user)
@@ -14,6 +14,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from ..core.logging import StructuredLogger, get_api_logger
 from ..core.constants import APIConstants
+from ..core.context import current_request_var
 
 logger = get_api_logger()
 structured_logger = StructuredLogger("api")
@@ -27,6 +28,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # 生成请求ID
         request_id = str(uuid.uuid4())
         request.state.request_id = request_id
+        # 供装饰器等在未声明Request参数时获取当前请求
+        request_token = current_request_var.set(request)
         
         # 记录请求开始时间
         start_time = time.time()
@@ -37,7 +40,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # 记录请求日志
         structured_logger.log_request(
             method=request.method,
-            path=str(request.url.path),
+            path=request.scope["path"],
             user_id=user_id,
             request_id=request_id,
             query_params=dict(request.query_params),
@@ -75,7 +78,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 context={
                     "request_id": request_id,
                     "method": request.method,
-                    "path": str(request.url.path),
+                    "path": request.scope["path"],
                     "user_id": user_id,
                     "duration": duration,
                 }
@@ -83,6 +86,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             
             # 重新抛出异常
             raise
+        finally:
+            current_request_var.reset(request_token)
 
 
 class CORSMiddleware(BaseHTTPMiddleware):
@@ -0,0 +1,218 @@
+"""
+缓存后端 - 为响应缓存、速率限制等功能提供可替换的存储
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import orjson
+from pydantic import BaseModel as PydanticBaseModel
+
+from .config import get_settings
+from .logging import get_logger
+
+# redis为可选依赖，仅在配置了 REDIS_URL 时使用
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = get_logger(__name__)
+
+# 进程内最多跟踪的限流键数量
+_RATE_LIMIT_MAX_KEYS = 100_000
+
+
+class CacheBackend(ABC):
+    """缓存后端接口"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """获取缓存值，不存在或已过期时返回None"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """写入缓存值，ttl为生存时间（秒）"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """删除缓存值"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """清空缓存"""
+
+    @abstractmethod
+    async def take_token(self, key: str, capacity: int, refill_rate: float) -> float:
+        """从令牌桶中取一个令牌
+
+        Args:
+            key: 限流键
+            capacity: 桶容量（允许的突发请求数）
+            refill_rate: 每秒补充的令牌数
+
+        Returns:
+            float: 0表示放行，否则为需要等待的秒数
+        """
+
+    async def close(self) -> None:
+        """释放后端持有的连接"""
+
+
+class InMemoryBackend(CacheBackend):
+    """进程内缓存 - 带TTL的LRU，条目数有上限，超出时淘汰最久未使用的条目"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # 限流键 -> (剩余令牌, 上次补充时间)，与缓存条目分开淘汰
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self._buckets.clear()
+
+    async def take_token(self, key: str, capacity: int, refill_rate: float) -> float:
+        # 使用单调时钟，不受系统时间调整影响
+        now = time.monotonic()
+        tokens, last_refill = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last_refill) * refill_rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / refill_rate
+
+        self._buckets[key] = (tokens - 1, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > _RATE_LIMIT_MAX_KEYS:
+            self._buckets.popitem(last=False)
+        return 0.0
+
+
+# 令牌桶的原子实现：以Redis服务器时间计算补充量，返回需要等待的秒数（字符串，避免被截断为整数）
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return tostring(wait)
+"""
+
+
+def _json_default(obj: Any) -> Any:
+    """Redis缓存值的JSON序列化：Pydantic模型按字段值保存，其他类型不支持"""
+    if isinstance(obj, PydanticBaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"无法序列化为JSON: {type(obj).__qualname__}")
+
+
+class RedisBackend(CacheBackend):
+    """Redis缓存 - 多个worker进程共享缓存与限流状态
+
+    缓存值以JSON保存（Pydantic模型读回时为字典），无法表示为JSON的值不写入Redis
+    """
+
+    def __init__(self, url: str, prefix: str = "cache:"):
+        self.prefix = prefix
+        self._client = aioredis.from_url(url)
+        # register_script 通过 EVALSHA 执行，脚本未加载时自动回退为 EVAL
+        self._take_token = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def get(self, key: str) -> Optional[Any]:
+        data = await self._client.get(self.prefix + key)
+        if data is None:
+            return None
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            logger.warning("Redis缓存值不是有效的JSON，忽略: %s", key)
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        # Redis由多个进程共享，只存JSON而不是pickle，读取缓存不会执行任意代码
+        try:
+            data = orjson.dumps(value, default=_json_default)
+        except TypeError:
+            logger.debug("缓存值无法序列化为JSON，不写入Redis: %s", key)
+            return
+        await self._client.set(self.prefix + key, data, ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        # 只删除本应用前缀下的键，不影响同一Redis中的其他数据
+        keys = [key async for key in self._client.scan_iter(match=self.prefix + "*", count=500)]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def take_token(self, key: str, capacity: int, refill_rate: float) -> float:
+        wait = await self._take_token(keys=[self.prefix + key], args=[capacity, refill_rate])
+        return float(wait)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """获取全局缓存后端（配置了 REDIS_URL 时使用Redis，否则为进程内缓存）"""
+    global _backend
+    if _backend is None:
+        settings = get_settings()
+        if settings.REDIS_URL and aioredis is not None:
+            _backend = RedisBackend(settings.REDIS_URL)
+        else:
+            if settings.REDIS_URL:
+                logger.warning("未安装redis，响应缓存与速率限制将使用进程内存储")
+            _backend = InMemoryBackend(settings.CACHE_MAX_ENTRIES)
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """替换全局缓存后端"""
+    global _backend
+    _backend = backend
+
+
+async def close_cache_backend() -> None:
+    """关闭全局缓存后端（应用关闭时调用）"""
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
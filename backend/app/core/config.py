@@ -2,17 +2,31 @@
 配置模块 - 提供应用配置和环境变量处理
 """
 import os
+import math
+import importlib
+import threading
+from enum import Enum
 from functools import lru_cache
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Callable, List, Tuple
 import logging
-import numpy as np
 
-from pydantic_settings import BaseSettings
+from pydantic import SecretStr, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from llama_index.core.embeddings import BaseEmbedding
 
 # 设置日志记录器
 logger = logging.getLogger(__name__)
 
+class Provider(str, Enum):
+    """LLM提供商枚举"""
+    OPENAI = "openai"
+    ANTHROPIC = "anthropic"
+    AZURE = "azure"
+    OLLAMA = "ollama"
+    LOCAL = "local"
+    DEEPSEEK = "deepseek"
+    GEMINI = "gemini"
+
 class Settings(BaseSettings):
     """应用配置"""
     # 应用设置
@@ -45,6 +59,10 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 120  # 连接池超时时间（秒）
     DB_POOL_RECYCLE: int = 1800  # 连接回收时间（秒）
     DB_LOCK_TIMEOUT: int = 60  # MySQL锁等待超时时间（秒）
+    ENABLE_REPO_CACHE: bool = False  # 是否启用Repository.get_by_id的进程内结果缓存（仅适合单进程部署）
+    REPO_CACHE_SIZE: int = 1024  # 结果缓存最大条目数
+    CACHE_MAX_ENTRIES: int = 1024  # 进程内响应缓存最大条目数
+    REDIS_URL: Optional[str] = None  # 设置后响应缓存与速率限制使用Redis（多worker部署时共享状态）
     
     # MySQL配置（当DATABASE_TYPE=mysql时使用）
     MYSQL_HOST: str = "localhost"
@@ -57,20 +75,23 @@ class Settings(BaseSettings):
     SQLITE_PATH: str = "data/ai_template.db"
     
     # API密钥
-    OPENAI_API_KEY: Optional[str] = None
-    ANTHROPIC_API_KEY: Optional[str] = None
-    AZURE_API_KEY: Optional[str] = None
-    DEEPSEEK_API_KEY: Optional[str] = None
-    GEMINI_API_KEY: Optional[str] = None
+    OPENAI_API_KEY: Optional[SecretStr] = None
+    ANTHROPIC_API_KEY: Optional[SecretStr] = None
+    AZURE_API_KEY: Optional[SecretStr] = None
+    DEEPSEEK_API_KEY: Optional[SecretStr] = None
+    GEMINI_API_KEY: Optional[SecretStr] = None
     
     # LLM配置
-    LLM_PROVIDER: str = "ollama"  # 可选值: "openai", "anthropic", "azure", "ollama", "local", "deepseek", "gemini"
+    LLM_PROVIDER: Provider = Provider.OLLAMA  # 可选值: "openai", "anthropic", "azure", "ollama", "local", "deepseek", "gemini"
     LLM_MODEL_NAME: str = "llama3.2:3b"  # 默认模型名称，使用更常见的模型
     
     # 嵌入模型配置
     EMBEDDING_PROVIDER: str = "ollama"  # 可选值: "openai", "huggingface", "ollama", "local", "deepseek", "gemini"
     EMBEDDING_MODEL_NAME: str = "bge-large"  # 默认嵌入模型，BGE-large在中文场景下效果更好
     
+    # 启动时在后台线程预热模型与提供商，隐藏首个请求的冷导入延迟
+    PREWARM_MODELS: bool = True
+    
     # 第三方服务配置
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OPENAI_BASE_URL: Optional[str] = None
@@ -83,15 +104,33 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7天
 
     # 网络搜索配置
-    GOOGLE_API_KEY: Optional[str] = None
+    GOOGLE_API_KEY: Optional[SecretStr] = None
     GOOGLE_CSE_ID: Optional[str] = None
 
-    class Config:
-        """Pydantic配置"""
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-        extra = "ignore"  # 允许额外字段，避免验证错误
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore",  # 允许额外字段，避免验证错误
+        frozen=True,  # 配置加载后只读
+    )
+
+    @field_validator("LLM_PROVIDER", mode="before")
+    @classmethod
+    def _parse_llm_provider(cls, v: Any) -> Provider:
+        """在加载配置时一次性将提供商解析为枚举，大小写不敏感；未知值回退到Ollama"""
+        if isinstance(v, Provider):
+            return v
+        try:
+            return Provider(str(v).strip().lower())
+        except ValueError:
+            logger.warning("未知的LLM提供程序: %s，回退到Ollama", v)
+            return Provider.OLLAMA
+
+    def get_secret(self, name: str) -> Optional[str]:
+        """获取密钥字段的明文值，未配置时返回None"""
+        value = getattr(self, name)
+        return value.get_secret_value() if value is not None else None
 
     def get_database_url(self) -> str:
         """根据配置生成数据库URL"""
@@ -118,232 +157,252 @@ class Settings(BaseSettings):
 
     def get_llm_params(self) -> Dict[str, Any]:
         """获取LLM模型的参数，基于当前配置"""
-        provider = self.LLM_PROVIDER.lower()
+        provider = self.LLM_PROVIDER
         params = {"model": self.LLM_MODEL_NAME}
         
-        if provider == "ollama":
+        if provider is Provider.OLLAMA:
             params["base_url"] = self.OLLAMA_BASE_URL
-        elif provider == "openai" and self.OPENAI_BASE_URL:
+        elif provider is Provider.OPENAI and self.OPENAI_BASE_URL:
             params["api_base"] = self.OPENAI_BASE_URL
-        elif provider == "azure":
-            params["api_key"] = self.AZURE_API_KEY
+        elif provider is Provider.AZURE:
+            params["api_key"] = self.get_secret("AZURE_API_KEY")
             # 对于Azure，使用engine而不是model
             params["engine"] = params.pop("model")
-        elif provider == "deepseek":
-            params["api_key"] = self.DEEPSEEK_API_KEY
+        elif provider is Provider.DEEPSEEK:
+            params["api_key"] = self.get_secret("DEEPSEEK_API_KEY")
             if self.DEEPSEEK_BASE_URL:
                 params["api_base"] = self.DEEPSEEK_BASE_URL
-        elif provider == "gemini":
-            params["api_key"] = self.GEMINI_API_KEY
+        elif provider is Provider.GEMINI:
+            params["api_key"] = self.get_secret("GEMINI_API_KEY")
             if self.GEMINI_BASE_URL:
                 params["api_base"] = self.GEMINI_BASE_URL
             
         return params
         
-    def get_embedding_params(self) -> Dict[str, Any]:
-        """获取嵌入模型的参数，基于当前配置"""
+    def get_embedding_key(self) -> Tuple[str, str, Optional[str], Optional[str]]:
+        """获取嵌入模型的缓存键: (提供商, 模型名称, 基础URL, API密钥)"""
         provider = self.EMBEDDING_PROVIDER.lower()
-        params = {"model_name": self.EMBEDDING_MODEL_NAME}
+        base_url = None
+        api_key = None
         
         if provider == "ollama":
-            params["base_url"] = self.OLLAMA_BASE_URL
+            base_url = self.OLLAMA_BASE_URL
         elif provider == "openai":
-            # OpenAI使用model而不是model_name
-            params["model"] = params.pop("model_name")
-            if self.OPENAI_BASE_URL:
-                params["api_base"] = self.OPENAI_BASE_URL
+            base_url = self.OPENAI_BASE_URL
         elif provider == "deepseek":
-            # DeepSeek使用OpenAI兼容接口
-            params["model"] = params.pop("model_name")
-            params["api_key"] = self.DEEPSEEK_API_KEY
-            if self.DEEPSEEK_BASE_URL:
-                params["api_base"] = self.DEEPSEEK_BASE_URL
+            base_url = self.DEEPSEEK_BASE_URL
+            api_key = self.get_secret("DEEPSEEK_API_KEY")
         elif provider == "gemini":
-            # Gemini使用自己的接口
-            params["model"] = params.pop("model_name")
-            params["api_key"] = self.GEMINI_API_KEY
-            if self.GEMINI_BASE_URL:
-                params["api_base"] = self.GEMINI_BASE_URL
-                
-        return params
+            base_url = self.GEMINI_BASE_URL
+            api_key = self.get_secret("GEMINI_API_KEY")
+        
+        return provider, self.EMBEDDING_MODEL_NAME, base_url, api_key
+        
+    def get_embedding_params(self) -> Dict[str, Any]:
+        """获取嵌入模型的参数，基于当前配置"""
+        return build_embedding_params(*self.get_embedding_key())
 
-@lru_cache()
-def get_settings():
-    """获取应用配置单例"""
+def build_embedding_params(
+    provider: str,
+    model_name: str,
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """根据嵌入模型缓存键构建初始化参数"""
+    params = {"model_name": model_name}
+    
+    if provider == "ollama":
+        params["base_url"] = base_url
+    elif provider == "openai":
+        # OpenAI使用model而不是model_name
+        params["model"] = params.pop("model_name")
+        if base_url:
+            params["api_base"] = base_url
+    elif provider in ("deepseek", "gemini"):
+        # DeepSeek使用OpenAI兼容接口，Gemini使用自己的接口，参数形式相同
+        params["model"] = params.pop("model_name")
+        params["api_key"] = api_key
+        if base_url:
+            params["api_base"] = base_url
+            
+    return params
+
+def _build_settings() -> Settings:
+    """构建应用配置"""
     settings = Settings()
-    logger.info(f"加载配置: LLM提供商={settings.LLM_PROVIDER}, 嵌入模型提供商={settings.EMBEDDING_PROVIDER}")
+    logger.info(f"加载配置: LLM提供商={settings.LLM_PROVIDER.value}, 嵌入模型提供商={settings.EMBEDDING_PROVIDER}")
     return settings
 
-@lru_cache()
-def get_embedding_model():
-    """获取嵌入模型"""
-    settings = get_settings()
-    provider = settings.EMBEDDING_PROVIDER.lower()
-    params = settings.get_embedding_params()
+def get_embedding_model(settings: Optional[Settings] = None):
+    """获取嵌入模型
+
+    按 (提供商, 模型名称, 基础URL, API密钥) 复用实例：切换配置不会拿到过期模型，
+    多套嵌入配置也可以在同一进程内共存。
+    """
+    settings = settings or get_settings()
+    return _build_embedding(*settings.get_embedding_key())
+
+@lru_cache(maxsize=1)
+def _local_embed_fallback():
+    """本地嵌入模型（回退用），全进程只构建一次"""
+    from llama_index.core.embeddings import resolve_embed_model
+    return resolve_embed_model("local")
+
+@lru_cache(maxsize=8)
+def _build_embedding(
+    provider: str,
+    model_name: str,
+    base_url: Optional[str],
+    api_key: Optional[str]
+):
+    """构建嵌入模型，任何失败都回退到本地模型"""
+    params = build_embedding_params(provider, model_name, base_url, api_key)
+    # 参数中含有API密钥，只记录不敏感的字段
+    logger.info("尝试初始化嵌入模型: 提供商=%s, 模型=%s, 基础URL=%s", provider, model_name, base_url)
+    
+    factory = _FACTORIES.get(("embedding", provider))
+    if factory is None:
+        logger.warning("未知的嵌入模型提供商: %s，回退到本地模型", provider)
+        return _local_embed_fallback()
     
     try:
-        logger.info(f"尝试初始化嵌入模型: 提供商={provider}, 模型={settings.EMBEDDING_MODEL_NAME}")
-        logger.info(f"嵌入模型参数: {params}")
-        
-        if provider == "ollama":
-            try:
-                logger.info("正在加载Ollama嵌入模型...")
-                from llama_index.embeddings.ollama import OllamaEmbedding
-                return OllamaEmbedding(**params)
-            except ImportError as e:
-                logger.error(f"Ollama嵌入模型导入失败: {e}")
-                logger.info("尝试fallback到本地嵌入模型...")
-                from llama_index.core.embeddings import resolve_embed_model
-                return resolve_embed_model("local")
-            
-        elif provider == "openai":
-            from llama_index.embeddings.openai import OpenAIEmbedding
-            return OpenAIEmbedding(**params)
-            
-        elif provider == "deepseek":
-            # DeepSeek使用OpenAI兼容接口
-            from llama_index.embeddings.openai import OpenAIEmbedding
-            logger.info("使用DeepSeek嵌入模型")
-            return OpenAIEmbedding(**params)
-            
-        elif provider == "gemini":
-            # Gemini嵌入模型
-            try:
-                logger.info("正在加载Gemini嵌入模型...")
-                from llama_index.embeddings.gemini import GeminiEmbedding
-                return GeminiEmbedding(**params)
-            except ImportError as e:
-                logger.error(f"Gemini嵌入模型导入失败: {e}")
-                logger.info("尝试fallback到本地嵌入模型...")
-                from llama_index.core.embeddings import resolve_embed_model
-                return resolve_embed_model("local")
-            
-        elif provider == "huggingface":
-            try:
-                logger.info("正在加载HuggingFace嵌入模型...")
-                from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-                return HuggingFaceEmbedding(**params)
-            except ImportError as e:
-                logger.error(f"HuggingFace嵌入模型导入失败: {e}")
-                logger.info("尝试fallback到本地嵌入模型...")
-                from llama_index.core.embeddings import resolve_embed_model
-                return resolve_embed_model("local")
-            
-        elif provider == "local":
-            logger.info("使用本地嵌入模型")
-            from llama_index.core.embeddings import resolve_embed_model
-            return resolve_embed_model("local")
-            
-        else:
-            logger.warning(f"未知的嵌入模型提供商: {provider}，回退到本地模型")
-            from llama_index.core.embeddings import resolve_embed_model
-            return resolve_embed_model("local")
-            
+        return factory(params)
     except Exception as e:
-        logger.error(f"加载嵌入模型失败: {str(e)}，回退到本地模型")
-        from llama_index.core.embeddings import resolve_embed_model
-        return resolve_embed_model("local")
+        logger.error("加载嵌入模型失败: %s，回退到本地模型", e)
+        return _local_embed_fallback()
 
 def normalize_embedding(embedding: List[float]) -> List[float]:
     """归一化向量的工具函数"""
-    embedding_array = np.array(embedding)
-    norm = np.linalg.norm(embedding_array)
-    if norm > 0:
-        normalized = embedding_array / norm
-        return normalized.tolist()
+    squared_sum = math.fsum(x * x for x in embedding)
+    if squared_sum > 0:
+        inv_norm = 1.0 / math.sqrt(squared_sum)
+        return [x * inv_norm for x in embedding]
     return embedding
 
-@lru_cache()
-def get_llm_model():
-    """获取LLM模型"""
+def _build_llm_model():
+    """构建LLM模型"""
     settings = get_settings()
-    provider = settings.LLM_PROVIDER.lower()
-    params = settings.get_llm_params()
+    provider = settings.LLM_PROVIDER
     
     try:
-        logger.info(f"初始化LLM模型: 提供商={provider}, 模型={settings.LLM_MODEL_NAME}")
-        
-        if provider == "ollama":
-            from llama_index.llms.ollama import Ollama
-            return Ollama(**params)
-            
-        elif provider == "openai":
-            from llama_index.llms.openai import OpenAI
-            return OpenAI(**params)
-            
-        elif provider == "anthropic":
-            from llama_index.llms.anthropic import Anthropic
-            return Anthropic(**params)
-            
-        elif provider == "azure":
-            from llama_index.llms.azure_openai import AzureOpenAI
-            return AzureOpenAI(**params)
-            
-        elif provider == "deepseek":
-            # 处理DeepSeek API，使用OpenAI兼容接口
-            from llama_index.llms.openai import OpenAI
-            logger.info("使用DeepSeek LLM")
-            return OpenAI(**params)
-            
-        elif provider == "gemini":
-            # 处理Gemini API
-            from llama_index.llms.gemini import Gemini
-            logger.info("使用Gemini LLM")
-            return Gemini(**params)
-            
-        elif provider == "local":
-            from llama_index.llms import LlamaCPP
-            return LlamaCPP(model_path=settings.LLM_MODEL_NAME)
-            
-        else:
-            logger.warning(f"未知的LLM提供程序: {provider}，回退到Ollama")
-            from llama_index.llms.ollama import Ollama
-            return Ollama(model="llama2")
-            
+        logger.info(f"初始化LLM模型: 提供商={provider.value}, 模型={settings.LLM_MODEL_NAME}")
+        # 未知提供商已在配置加载时回退到Ollama，这里每个枚举值都有对应的工厂
+        return _FACTORIES[("llm", provider.value)](settings)
     except Exception as e:
         logger.error(f"加载LLM模型失败: {str(e)}")
         raise ValueError(f"无法加载LLM模型: {str(e)}")
 
-@lru_cache()
+def _build_provider():
+    """构建LLM提供商"""
+    settings = get_settings()
+    factory = _FACTORIES.get(("provider", settings.LLM_PROVIDER.value))
+    if factory is None:
+        raise ValueError(f"不支持的LLM提供商类型: {settings.LLM_PROVIDER.value}")
+    return factory(settings)
+
+def _import(module: str, name: str) -> Any:
+    """按需导入提供商SDK中的类（支持相对于本包的模块路径）"""
+    return getattr(importlib.import_module(module, __package__), name)
+
+def _ollama_provider(settings: Settings) -> Any:
+    """Ollama提供商（本地模型也使用Ollama包装器）"""
+    return _import("..lib.providers.ollama", "OllamaProvider")(
+        api_key="ollama-local",
+        base_url=settings.OLLAMA_BASE_URL
+    )
+
+# (类别, 提供商) -> 工厂函数。SDK只在工厂首次调用时导入；
+# 嵌入模型工厂接收 build_embedding_params 的结果，其余工厂接收 Settings
+_FACTORIES: Dict[Tuple[str, str], Callable[[Any], Any]] = {
+    ("embedding", "ollama"): lambda p: _import("llama_index.embeddings.ollama", "OllamaEmbedding")(**p),
+    ("embedding", "openai"): lambda p: _import("llama_index.embeddings.openai", "OpenAIEmbedding")(**p),
+    # DeepSeek使用OpenAI兼容接口
+    ("embedding", "deepseek"): lambda p: _import("llama_index.embeddings.openai", "OpenAIEmbedding")(**p),
+    ("embedding", "gemini"): lambda p: _import("llama_index.embeddings.gemini", "GeminiEmbedding")(**p),
+    ("embedding", "huggingface"): lambda p: _import("llama_index.embeddings.huggingface", "HuggingFaceEmbedding")(**p),
+    ("embedding", "local"): lambda p: _local_embed_fallback(),
+
+    ("llm", "ollama"): lambda s: _import("llama_index.llms.ollama", "Ollama")(**s.get_llm_params()),
+    ("llm", "openai"): lambda s: _import("llama_index.llms.openai", "OpenAI")(**s.get_llm_params()),
+    ("llm", "anthropic"): lambda s: _import("llama_index.llms.anthropic", "Anthropic")(**s.get_llm_params()),
+    ("llm", "azure"): lambda s: _import("llama_index.llms.azure_openai", "AzureOpenAI")(**s.get_llm_params()),
+    # DeepSeek使用OpenAI兼容接口
+    ("llm", "deepseek"): lambda s: _import("llama_index.llms.openai", "OpenAI")(**s.get_llm_params()),
+    ("llm", "gemini"): lambda s: _import("llama_index.llms.gemini", "Gemini")(**s.get_llm_params()),
+    ("llm", "local"): lambda s: _import("llama_index.llms", "LlamaCPP")(model_path=s.LLM_MODEL_NAME),
+
+    ("provider", "openai"): lambda s: _import("..lib.providers.openai", "OpenAIProvider")(
+        api_key=s.get_secret("OPENAI_API_KEY"), base_url=s.OPENAI_BASE_URL),
+    ("provider", "deepseek"): lambda s: _import("..lib.providers.deepseek", "DeepSeekProvider")(
+        api_key=s.get_secret("DEEPSEEK_API_KEY"), base_url=s.DEEPSEEK_BASE_URL),
+    ("provider", "gemini"): lambda s: _import("..lib.providers.gemini", "GeminiProvider")(
+        api_key=s.get_secret("GEMINI_API_KEY"), base_url=s.GEMINI_BASE_URL),
+    ("provider", "azure"): lambda s: _import("..lib.providers.azure", "AzureOpenAIProvider")(
+        api_key=s.get_secret("AZURE_API_KEY"), base_url=getattr(s, 'AZURE_BASE_URL', None)),
+    ("provider", "ollama"): _ollama_provider,
+    ("provider", "local"): _ollama_provider,
+}
+
+# 模块级惰性单例（PEP 562）：首次访问 settings / embedding_model / llm / provider 时构建，
+# 之后直接写入模块全局变量，后续访问只是一次普通的属性查找
+_LAZY_BUILDERS = {
+    "settings": _build_settings,
+    "embedding_model": get_embedding_model,
+    "llm": _build_llm_model,
+    "provider": _build_provider,
+}
+_lazy_lock = threading.Lock()
+
+def __getattr__(name: str) -> Any:
+    """按需构建惰性单例
+
+    构建在锁外进行（预热线程导入SDK时不会阻塞其他单例的访问），只在发布时加锁；
+    并发构建时以先发布者为准，其余结果直接丢弃。
+    """
+    builder = _LAZY_BUILDERS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = builder()
+    with _lazy_lock:
+        return globals().setdefault(name, value)
+
+def _lazy(name: str) -> Any:
+    """读取惰性单例，未构建时触发构建"""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+def get_settings() -> Settings:
+    """获取应用配置单例"""
+    return _lazy("settings")
+
+def get_llm_model():
+    """获取LLM模型"""
+    return _lazy("llm")
+
 def get_provider():
     """获取LLM提供商"""
-    settings = get_settings()
-    
-    # 根据LLM_PROVIDER确定要使用的提供商
-    provider_type = settings.LLM_PROVIDER.lower()
-    
-    if provider_type == "openai":
-        from ..lib.providers.openai import OpenAIProvider
-        api_key = settings.OPENAI_API_KEY
-        base_url = settings.OPENAI_BASE_URL
-        return OpenAIProvider(api_key=api_key, base_url=base_url)
-    elif provider_type == "deepseek":
-        from ..lib.providers.deepseek import DeepSeekProvider
-        api_key = settings.DEEPSEEK_API_KEY
-        base_url = settings.DEEPSEEK_BASE_URL
-        return DeepSeekProvider(api_key=api_key, base_url=base_url)
-    elif provider_type == "gemini":
-        from ..lib.providers.gemini import GeminiProvider
-        api_key = settings.GEMINI_API_KEY
-        base_url = settings.GEMINI_BASE_URL
-        return GeminiProvider(api_key=api_key, base_url=base_url)
-    elif provider_type == "azure":
-        from ..lib.providers.azure import AzureOpenAIProvider
-        api_key = settings.AZURE_API_KEY
-        base_url = getattr(settings, 'AZURE_BASE_URL', None)
-        return AzureOpenAIProvider(api_key=api_key, base_url=base_url)
-    elif provider_type == "ollama":
-        from ..lib.providers.ollama import OllamaProvider
-        return OllamaProvider(
-            api_key="ollama-local", 
-            base_url=settings.OLLAMA_BASE_URL
-        )
-    elif provider_type == "local":
-        # 对于本地模型，仍然使用Ollama包装器
-        from ..lib.providers.ollama import OllamaProvider
-        return OllamaProvider(
-            api_key="ollama-local", 
-            base_url=settings.OLLAMA_BASE_URL
-        )
-    else:
-        raise ValueError(f"不支持的LLM提供商类型: {provider_type}") 
\ No newline at end of file
+    return _lazy("provider")
+
+def prewarm() -> threading.Thread:
+    """在后台守护线程中预热LLM模型、嵌入模型和提供商
+
+    应在 FastAPI lifespan 启动阶段调用：提供商SDK的冷导入和模型构建与事件循环
+    空闲时间重叠，首个请求命中的已是构建好的单例。
+    """
+    def _warm():
+        for name, getter in (
+            ("LLM模型", get_llm_model),
+            ("嵌入模型", get_embedding_model),
+            ("LLM提供商", get_provider),
+        ):
+            try:
+                getter()
+            except Exception as e:
+                logger.warning("预热%s失败: %s", name, e)
+        logger.info("模型预热完成")
+
+    thread = threading.Thread(target=_warm, name="config-prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -1,7 +1,8 @@
 """
 应用常量配置 - 统一管理所有魔法数字和硬编码值
 """
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Tuple
 
 class APIConstants:
     """API相关常量"""
@@ -171,8 +172,8 @@ class ServerConstants:
     PRODUCTION = "production"
     TESTING = "testing"
 
-# 配置映射字典，便于动态访问
-CONFIG_MAPPING: Dict[str, Any] = {
+# 配置映射字典，便于动态访问（只读）
+CONFIG_MAPPING: Mapping[str, Any] = MappingProxyType({
     "api": APIConstants,
     "chat": ChatConstants,
     "conversation": ConversationConstants,
@@ -184,7 +185,15 @@ CONFIG_MAPPING: Dict[str, Any] = {
     "llm": LLMConstants,
     "validation": ValidationConstants,
     "server": ServerConstants,
-}
+})
+
+# 预先展开为 (类别, 名称) -> 值 的只读表，查找时只需一次哈希
+_FLAT_CONSTANTS: Mapping[Tuple[str, str], Any] = MappingProxyType({
+    (category, name): getattr(constant_class, name)
+    for category, constant_class in CONFIG_MAPPING.items()
+    for name in dir(constant_class)
+    if name.isupper()
+})
 
 def get_constant(category: str, name: str, default: Any = None) -> Any:
     """
@@ -198,10 +207,4 @@ def get_constant(category: str, name: str, default: Any = None) -> Any:
     Returns:
         常量值
     """
-    try:
-        constant_class = CONFIG_MAPPING.get(category)
-        if constant_class:
-            return getattr(constant_class, name, default)
-        return default
-    except Exception:
-        return default 
\ No newline at end of file
+    return _FLAT_CONSTANTS.get((category, name), default)
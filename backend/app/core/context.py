@@ -0,0 +1,13 @@
+"""
+请求上下文 - 通过 contextvars 在一次请求的处理链路中共享当前请求与当前用户
+"""
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from starlette.requests import Request
+
+# 由 RequestLoggingMiddleware 在请求进入时设置
+current_request_var: ContextVar[Optional[Request]] = ContextVar("current_request", default=None)
+
+# 由认证依赖在解析出用户后设置（依赖与端点在同一任务上下文中执行）
+current_user_var: ContextVar[Optional[Any]] = ContextVar("current_user", default=None)
@@ -2,9 +2,13 @@
 数据库连接模块 - 使用 SQLAlchemy ORM
 """
 import os
-import json
+import asyncio
+import orjson
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TypeVar, Generic, Type, AsyncGenerator
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Generic, Type, AsyncGenerator, AsyncIterator
 import uuid
 from datetime import datetime
 from .logging import get_logger
@@ -12,9 +16,11 @@ from enum import Enum
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import Column, String, DateTime, func, select, update, delete, text
+from sqlalchemy.orm import sessionmaker, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy import Column, String, DateTime, func, select, insert, update, delete, event, bindparam, lambda_stmt, inspect, text
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from .config import get_settings
 
@@ -31,14 +37,50 @@ class BaseModel(Base):
     __abstract__ = True
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    # 时间戳统一使用应用端本地时间：SQLite的 CURRENT_TIMESTAMP 是UTC，与 datetime.now() 混用会错开时区
+    created_at = Column(DateTime, default=datetime.now, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=datetime.now)
+
+# SQLite连接级PRAGMA：WAL让读写互不阻塞，NORMAL同步在WAL下足够安全且fsync更少，
+# busy_timeout避免并发写入时直接抛出 "database is locked"
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+)
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """每个新建的SQLite连接执行一次PRAGMA设置"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+def _create_missing_tables(connection):
+    """一次性获取已有表名，只为缺失的表执行DDL，避免逐表检查是否存在"""
+    existing = set(inspect(connection).get_table_names())
+    missing = [table for table in Base.metadata.sorted_tables if table.name not in existing]
+    if missing:
+        Base.metadata.create_all(connection, tables=missing, checkfirst=False)
 
 class DatabaseManager:
     """数据库管理器 - 使用 SQLAlchemy"""
     
     def __init__(self):
         self.settings = get_settings()
+        # 串行化引擎重建，避免并发的连接错误重复重建
+        self._engine_lock = asyncio.Lock()
+        (self.engine, self.async_session,
+         self.read_engine, self.async_read_session) = self._build_engines()
+    
+    def _build_engines(self):
+        """构建写引擎、只读引擎及对应的会话工厂"""
         database_url = self.settings.get_database_url()
         logger.info(f"使用数据库: {self.settings.DATABASE_TYPE} - {database_url.split('@')[0]}@***")
         
@@ -59,91 +101,166 @@ class DatabaseManager:
                 )
             }
         
-        # 🔥 改进连接池配置 - 防止连接丢失
-        self.engine = create_async_engine(
-            database_url,
-            echo=self.settings.DATABASE_ECHO,
-            pool_size=max(5, self.settings.DB_POOL_SIZE),  # 最少5个连接
-            max_overflow=max(10, self.settings.DB_MAX_OVERFLOW),  # 最少10个溢出连接
-            pool_timeout=30,  # 30秒获取连接超时
-            pool_pre_ping=True,  # 🔥 连接前检查连接是否有效
-            pool_recycle=1800,   # 🔥 30分钟回收连接，防止长时间连接超时
-            connect_args=connect_args,
-            # 🔥 添加连接重试机制
-            execution_options={
-                "isolation_level": "READ_COMMITTED",
-                "autocommit": False
-            }
-        )
-        self.async_session = async_sessionmaker(
-            self.engine, 
+        is_sqlite = self.is_sqlite
+        if is_sqlite:
+            # 扩大sqlite3连接内的预编译语句缓存（默认128）
+            connect_args = {"cached_statements": 256}
+        # SQLite同样使用常规连接池：WAL下读写互不阻塞，写入者之间由 busy_timeout 串行化，
+        # 单连接池会让所有会话（包括嵌套会话）排队等待。也不使用NullPool：aiosqlite
+        # 每个新连接都要启动一个线程并重新执行全部PRAGMA，按会话重连比复用连接更慢
+        pool_size = max(5, self.settings.DB_POOL_SIZE)  # 最少5个连接
+        max_overflow = max(10, self.settings.DB_MAX_OVERFLOW)  # 最少10个溢出连接
+        
+        engine = self._create_engine(database_url, pool_size, max_overflow, connect_args)
+        async_session = async_sessionmaker(
+            engine, 
             class_=AsyncSession, 
             expire_on_commit=False,
             autoflush=True,  # 自动刷新
             autocommit=False,  # 手动控制事务
         )
+        
+        if is_sqlite:
+            # WAL模式下读连接互不阻塞，单独使用只读连接池，规模随DB_POOL_SIZE扩展
+            read_url = f"sqlite+aiosqlite:///file:{self.settings.SQLITE_PATH}?mode=ro&uri=true"
+            read_engine = self._create_engine(
+                read_url, max(1, self.settings.DB_POOL_SIZE), 0, connect_args
+            )
+            async_read_session = async_sessionmaker(
+                read_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+            )
+        else:
+            read_engine, async_read_session = engine, async_session
+        
+        return engine, async_session, read_engine, async_read_session
     
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """获取数据库会话 - 带重试机制"""
-        max_retries = 3
-        retry_count = 0
+    def _create_engine(self, database_url: str, pool_size: int, max_overflow: int, connect_args: Dict[str, Any]):
+        """创建异步引擎"""
+        is_sqlite = self.is_sqlite
+        # SQLite不支持READ COMMITTED隔离级别，使用方言默认值
+        execution_options = {"autocommit": False} if is_sqlite else {
+            "isolation_level": "READ_COMMITTED",
+            "autocommit": False
+        }
+        
+        pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": 30,  # 30秒获取连接超时
+        }
+        if not is_sqlite:
+            # 🔥 改进连接池配置 - 防止连接丢失
+            # 本地SQLite文件不存在连接断开/超时问题，无需检查和回收
+            pool_options.update(
+                pool_pre_ping=True,  # 🔥 连接前检查连接是否有效
+                pool_recycle=1800,   # 🔥 30分钟回收连接，防止长时间连接超时
+            )
         
-        while retry_count < max_retries:
+        engine = create_async_engine(
+            database_url,
+            echo=self.settings.DATABASE_ECHO,
+            connect_args=connect_args,
+            # 🔥 添加连接重试机制
+            execution_options=execution_options,
+            **pool_options
+        )
+        if is_sqlite:
+            event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        return engine
+    
+    @staticmethod
+    def _is_connection_error(error: Exception) -> bool:
+        """是否为连接相关错误"""
+        # 连接池获取超时说明连接都在使用中，并非连接失效，重建连接池无济于事
+        if isinstance(error, PoolTimeoutError):
+            return False
+        error_msg = str(error).lower()
+        return any(keyword in error_msg for keyword in [
+            'lost connection', 'connection', 'timeout', 'broken pipe', 
+            'server has gone away', 'connection reset'
+        ])
+    
+    @asynccontextmanager
+    async def get_session(self) -> AsyncIterator[AsyncSession]:
+        """获取数据库会话 - 正常退出时提交，异常时回滚
+        
+        连接有效性由 pool_pre_ping 在检出时检查（SQLite除外）；遇到连接错误时重建连接池，
+        后续会话使用新引擎（已执行的事务无法安全重放，错误仍向上抛出）
+        """
+        # 记录本次使用的引擎，重建时据此判断是否已被其他协程替换
+        engine = self.engine
+        async with self.async_session() as session:
             try:
-                async with self.async_session() as session:
-                    try:
-                        # 🔥 添加连接健康检查
-                        await session.execute(text("SELECT 1"))
-                        yield session
-                        # 在正常情况下提交事务
-                        await session.commit()
-                        return  # 成功，退出重试循环
-                    except Exception as e:
-                        await session.rollback()
-                        raise
-                    finally:
-                        # 确保会话被正确关闭
-                        await session.close()
-                        
+                yield session
+                await session.commit()
             except Exception as e:
-                retry_count += 1
-                error_msg = str(e)
+                await session.rollback()
+                if self._is_connection_error(e):
+                    logger.warning(f"数据库连接错误，重建连接池: {e}")
+                    await self._recreate_engine(engine)
+                raise
+    
+    @asynccontextmanager
+    async def get_read_session(self) -> AsyncIterator[AsyncSession]:
+        """获取只读数据库会话（SQLite下使用独立的只读连接池）"""
+        async with self.async_read_session() as session:
+            yield session
+    
+    async def _recreate_engine(self, stale_engine=None):
+        """重新创建数据库引擎 - 用于连接恢复
+        
+        新引擎构建完成后一次性替换，随后再关闭旧引擎；
+        如果 stale_engine 已被其他协程替换，则直接复用新引擎。
+        """
+        async with self._engine_lock:
+            if stale_engine is not None and stale_engine is not self.engine:
+                return
+            try:
+                logger.info("重新创建数据库引擎...")
+                old_engines = [self.engine]
+                if self.read_engine is not self.engine:
+                    old_engines.append(self.read_engine)
                 
-                # 🔥 检查是否是连接相关错误
-                if any(keyword in error_msg.lower() for keyword in [
-                    'lost connection', 'connection', 'timeout', 'broken pipe', 
-                    'server has gone away', 'connection reset'
-                ]):
-                    if retry_count < max_retries:
-                        logger.warning(f"数据库连接错误，第{retry_count}次重试: {error_msg}")
-                        # 🔥 重新创建引擎，清理连接池
-                        await self._recreate_engine()
-                        continue
-                    else:
-                        logger.error(f"数据库连接失败，已重试{max_retries}次: {error_msg}")
-                        raise
-                else:
-                    # 非连接错误，直接抛出
-                    raise
-    
-    async def _recreate_engine(self):
-        """重新创建数据库引擎 - 用于连接恢复"""
-        try:
-            # 关闭现有引擎
-            await self.engine.dispose()
-            logger.info("重新创建数据库引擎...")
-            
-            # 重新初始化
-            self.__init__()
-            logger.info("数据库引擎重新创建成功")
-        except Exception as e:
-            logger.error(f"重新创建数据库引擎失败: {e}")
-            raise
+                (self.engine, self.async_session,
+                 self.read_engine, self.async_read_session) = self._build_engines()
+                
+                # 关闭旧引擎
+                for engine in old_engines:
+                    await engine.dispose()
+                logger.info("数据库引擎重新创建成功")
+            except Exception as e:
+                logger.error(f"重新创建数据库引擎失败: {e}")
+                raise
+    
+    @property
+    def is_sqlite(self) -> bool:
+        """是否使用SQLite"""
+        return self.settings.DATABASE_TYPE.lower() == "sqlite"
     
     async def create_tables(self):
         """创建数据库表"""
         async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_missing_tables)
+            if self.is_sqlite:
+                # 收集统计信息，让查询规划器能够选用外键索引
+                await conn.execute(text("ANALYZE"))
+    
+    async def close(self):
+        """关闭数据库连接池（应用关闭时调用）"""
+        if self.is_sqlite:
+            try:
+                # 根据本次运行的查询情况按需更新统计信息
+                async with self.engine.connect() as conn:
+                    await conn.execute(text("PRAGMA optimize"))
+            except Exception as e:
+                logger.warning(f"执行 PRAGMA optimize 失败: {e}")
+        
+        await self.engine.dispose()
+        if self.read_engine is not self.engine:
+            await self.read_engine.dispose()
     
     async def drop_tables(self):
         """删除所有表（仅用于测试）"""
@@ -156,7 +273,7 @@ db_manager = DatabaseManager()
 # 全局get_session函数，用于FastAPI依赖注入
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """获取数据库会话（全局函数）"""
-    async for session in db_manager.get_session():
+    async with db_manager.get_session() as session:
         yield session
 
 # 为了向后兼容，保留原有的Database类接口
@@ -173,15 +290,84 @@ class Database:
     
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         """获取数据库会话"""
-        async for session in self.manager.get_session():
+        async with self.manager.get_session() as session:
             yield session
 
+# 更新时不视为实际变更的字段
+_TIMESTAMP_FIELDS = frozenset({'created_at', 'updated_at'})
+
+# 不做结果缓存的表：用户状态（禁用、权限）需要立即生效
+_UNCACHED_TABLES = frozenset({'users'})
+
+class _EntityCache:
+    """get_by_id 的进程内LRU结果缓存，按 (表名, ID) 保存列值快照
+    
+    只缓存列值而不缓存ORM实例，命中时再合并到当前会话，避免跨会话共享对象。
+    只有经由 Repository 的更新/删除会使缓存失效，因此默认关闭（ENABLE_REPO_CACHE）。
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+    
+    def get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        values = self._data.get(key)
+        if values is not None:
+            self._data.move_to_end(key)
+        return values
+    
+    def put(self, key: Tuple[str, str], values: Dict[str, Any]) -> None:
+        self._data[key] = values
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: Tuple[str, str]) -> None:
+        self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        self._data.clear()
+
+_entity_cache = _EntityCache(db_manager.settings.REPO_CACHE_SIZE)
+
+@lru_cache(maxsize=None)
+def _model_statements(model_class) -> Dict[str, Any]:
+    """按模型类缓存常用语句，ID通过绑定参数传入，便于复用编译缓存"""
+    return {
+        "all": select(model_class),
+        "insert": insert(model_class),
+        "delete": delete(model_class).where(model_class.id == bindparam("entity_id")),
+    }
+
+def _where_equals(column, value):
+    """生成 column == value 的lambda条件，value作为绑定参数传入"""
+    return lambda stmt: stmt.where(column == value)
+
+def _where_is_null(column):
+    """生成 column IS NULL 的lambda条件（None不能作为绑定参数做等值比较）"""
+    return lambda stmt: stmt.where(column.is_(None))
+
 class Repository(Generic[T]):
     """通用仓库基类 - 使用 SQLAlchemy"""
     
     def __init__(self, model_class: Type[T], session: AsyncSession):
         self.model_class = model_class
         self.session = session
+        self._statements = _model_statements(model_class)
+        table_name = getattr(model_class, '__tablename__', None)
+        self._cache_enabled = (
+            db_manager.settings.ENABLE_REPO_CACHE and table_name not in _UNCACHED_TABLES
+        )
+    
+    @staticmethod
+    def _serialize_values(values: Dict[str, Any]) -> Dict[str, Any]:
+        """处理复杂类型：dict/list 序列化为JSON，枚举取值"""
+        for key, value in values.items():
+            if isinstance(value, (dict, list)):
+                values[key] = orjson.dumps(value).decode()
+            elif isinstance(value, Enum):
+                values[key] = value.value
+        return values
     
     async def create(self, **kwargs) -> T:
         """创建实体"""
@@ -191,12 +377,7 @@ class Repository(Generic[T]):
         if 'created_at' not in kwargs:
             kwargs['created_at'] = datetime.now()
             
-        # 处理复杂类型
-        for key, value in kwargs.items():
-            if isinstance(value, (dict, list)):
-                kwargs[key] = json.dumps(value, ensure_ascii=False)
-            elif isinstance(value, Enum):
-                kwargs[key] = value.value
+        self._serialize_values(kwargs)
                 
         instance = self.model_class(**kwargs)
         self.session.add(instance)
@@ -204,51 +385,102 @@ class Repository(Generic[T]):
         await self.session.refresh(instance)
         return instance
     
+    async def bulk_create(self, entities: List[Dict[str, Any]]) -> int:
+        """批量创建实体 - 单条INSERT语句批量执行，只flush一次"""
+        if not entities:
+            return 0
+        
+        now = datetime.now()
+        rows = []
+        for entity in entities:
+            row = dict(entity)
+            if not row.get('id'):
+                row['id'] = str(uuid.uuid4())
+            row.setdefault('created_at', now)
+            rows.append(self._serialize_values(row))
+        
+        await self.session.execute(self._statements["insert"], rows)
+        await self.session.flush()  # 使用flush而不是commit
+        return len(rows)
+    
     async def update(self, entity_id: str, **kwargs) -> Optional[T]:
-        """更新实体"""
-        kwargs['updated_at'] = datetime.now()
+        """更新实体（updated_at 由列的 onupdate 生成）"""
+        kwargs.pop('id', None)
+        # 只有时间戳字段时没有实际变更，跳过UPDATE
+        if kwargs.keys() <= _TIMESTAMP_FIELDS:
+            return await self.get_by_id(entity_id)
+        
+        self._serialize_values(kwargs)
         
-        # 处理复杂类型
-        for key, value in kwargs.items():
-            if isinstance(value, (dict, list)):
-                kwargs[key] = json.dumps(value, ensure_ascii=False)
-            elif isinstance(value, Enum):
-                kwargs[key] = value.value
-                
         stmt = update(self.model_class).where(
             self.model_class.id == entity_id
         ).values(**kwargs)
         
         await self.session.execute(stmt)
         await self.session.flush()  # 使用flush而不是commit
+        self._invalidate(entity_id)
         
-        return await self.get_by_id(entity_id)
+        # UPDATE语句不会同步会话中的实例，重新加载以覆盖已过期的属性
+        return await self.session.get(self.model_class, entity_id, populate_existing=True)
     
     async def delete(self, entity_id: str) -> bool:
         """删除实体"""
-        stmt = delete(self.model_class).where(self.model_class.id == entity_id)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(self._statements["delete"], {"entity_id": entity_id})
         await self.session.flush()  # 使用flush而不是commit
+        self._invalidate(entity_id)
         return result.rowcount > 0
     
     async def get_by_id(self, entity_id: str) -> Optional[T]:
         """通过ID获取实体"""
-        stmt = select(self.model_class).where(self.model_class.id == entity_id)
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        if not self._cache_enabled:
+            # 优先命中会话的identity map，未命中时才按主键查询
+            return await self.session.get(self.model_class, entity_id)
+        
+        # 会话中已有的实例优先，避免用缓存快照覆盖未提交的修改
+        instance = self.session.identity_map.get(identity_key(self.model_class, entity_id))
+        if instance is not None:
+            return instance
+        
+        cache_key = (self.model_class.__tablename__, entity_id)
+        values = _entity_cache.get(cache_key)
+        if values is not None:
+            instance = self.model_class(**values)
+            make_transient_to_detached(instance)
+            return await self.session.merge(instance, load=False)
+        
+        instance = await self.session.get(self.model_class, entity_id)
+        if instance is not None:
+            _entity_cache.put(cache_key, {
+                attr.key: getattr(instance, attr.key)
+                for attr in inspect(self.model_class).column_attrs
+            })
+        return instance
+    
+    def _invalidate(self, entity_id: str) -> None:
+        """使结果缓存中的实体失效"""
+        if self._cache_enabled:
+            _entity_cache.pop((self.model_class.__tablename__, entity_id))
     
     async def get_all(self) -> List[T]:
         """获取所有实体"""
-        stmt = select(self.model_class)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(self._statements["all"])
         return list(result.scalars().all())
     
+    async def iter_all(self) -> AsyncIterator[T]:
+        """流式遍历所有实体，逐批从游标读取，避免一次性加载整张表"""
+        result = await self.session.stream(self._statements["all"])
+        async for entity in result.scalars():
+            yield entity
+    
     async def find_by(self, **kwargs) -> List[T]:
         """根据条件查找实体"""
-        stmt = select(self.model_class)
+        # lambda_stmt按lambda代码位置缓存编译结果，相同条件组合的查询不再重复编译
+        model_class = self.model_class
+        stmt = lambda_stmt(lambda: select(model_class))
         for key, value in kwargs.items():
-            if hasattr(self.model_class, key):
-                stmt = stmt.where(getattr(self.model_class, key) == value)
+            if hasattr(model_class, key):
+                column = getattr(model_class, key)
+                stmt += _where_is_null(column) if value is None else _where_equals(column, value)
         
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
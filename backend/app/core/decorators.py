@@ -1,22 +1,131 @@
 """
 通用装饰器 - 消除API路由中的重复代码
 """
+import math
 import time
+import asyncio
+import inspect
+import logging
+import hashlib
 import functools
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type, Union
+
+import orjson
+import xxhash
 from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel as PydanticBaseModel
 
+from .cache import get_cache_backend
+from .context import current_request_var, current_user_var
 from .logging import get_api_logger
 from .errors import (
     NotFoundException, ValidationException, AuthorizationException,
     ServiceException, BaseAppException
 )
 from .messages import get_message, MessageKeys
-from ..api.utils import api_response, get_request_id
+from ..api.deps import api_response
+from ..api.utils import get_request_id
 
 logger = get_api_logger()
 
+class _ParamLayout(NamedTuple):
+    """被装饰函数中请求、当前用户、请求体参数的 (位置, 名称)，不存在时为None"""
+    request: Optional[Tuple[Optional[int], str]]
+    user: Optional[Tuple[Optional[int], str]]
+    body: Optional[Tuple[Optional[int], str]]
+
+@functools.lru_cache(maxsize=None)
+def _resolve_params(func: Callable) -> _ParamLayout:
+    """装饰时解析一次函数签名（会沿 __wrapped__ 找到原始端点函数）"""
+    try:
+        parameters = inspect.signature(func, eval_str=True).parameters.values()
+    except (TypeError, ValueError, NameError):
+        return _ParamLayout(None, None, None)
+    
+    request = user = body = None
+    for index, param in enumerate(parameters):
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        slot = (None if param.kind == param.KEYWORD_ONLY else index, param.name)
+        annotation = param.annotation if isinstance(param.annotation, type) else None
+        if request is None and annotation and issubclass(annotation, Request):
+            request = slot
+        elif user is None and param.name == 'current_user':
+            user = slot
+        elif body is None and annotation and issubclass(annotation, PydanticBaseModel):
+            body = slot
+    return _ParamLayout(request, user, body)
+
+def _bound_arg(args: tuple, kwargs: dict, slot: Optional[Tuple[Optional[int], str]]) -> Any:
+    """按签名解析结果取参数值（FastAPI以关键字方式调用端点，优先查kwargs）"""
+    if slot is None:
+        return None
+    position, name = slot
+    if name in kwargs:
+        return kwargs[name]
+    if position is not None and position < len(args):
+        return args[position]
+    return None
+
+def _request_arg(args: tuple, kwargs: dict, layout: _ParamLayout) -> Any:
+    """当前请求：优先取端点参数，端点未声明Request参数时取请求上下文"""
+    request = _bound_arg(args, kwargs, layout.request)
+    return request if request is not None else current_request_var.get()
+
+def _user_arg(args: tuple, kwargs: dict, layout: _ParamLayout) -> Any:
+    """当前用户：优先取端点的 current_user 参数，否则取请求上下文"""
+    user = _bound_arg(args, kwargs, layout.user)
+    return user if user is not None else current_user_var.get()
+
+def _message_template(key: str) -> str:
+    """解析消息模板，保留 {error} 占位符供出错时填充"""
+    return get_message(key, error="{error}")
+
+def _exception_responder(
+    not_found_message: str = MessageKeys.RESOURCE_NOT_FOUND,
+    forbidden_message: str = MessageKeys.FORBIDDEN,
+    validation_message: str = MessageKeys.VALIDATION_ERROR,
+    internal_error_message: str = MessageKeys.INTERNAL_ERROR
+) -> Callable[[Exception], Any]:
+    """构建 异常 -> 错误响应 的转换函数（需在except块内调用以记录堆栈）"""
+    # 异常类型 -> (状态码, 日志说明, 消息键, 消息模板)，消息模板在装饰时解析一次
+    handlers: Dict[type, Optional[Tuple[int, str, str, str]]] = {
+        NotFoundException: (404, "资源未找到", not_found_message, _message_template(not_found_message)),
+        AuthorizationException: (403, "权限不足", forbidden_message, _message_template(forbidden_message)),
+        ValidationException: (400, "验证失败", validation_message, _message_template(validation_message)),
+        ServiceException: (500, "服务错误", internal_error_message, _message_template(internal_error_message)),
+    }
+    internal_error = get_message(internal_error_message, error="系统内部错误")
+    
+    def resolve(exc_type: type) -> Optional[Tuple[int, str, str, str]]:
+        """按MRO查找处理方式，结果按具体异常类型缓存"""
+        if exc_type not in handlers:
+            handlers[exc_type] = next(
+                (handlers[cls] for cls in exc_type.__mro__[1:] if handlers.get(cls)),
+                None
+            )
+        return handlers[exc_type]
+    
+    def respond(e: Exception) -> Any:
+        handler = resolve(type(e)) if isinstance(e, BaseAppException) else None
+        if handler is None:
+            logger.error("未知错误: %s", e, exc_info=True)
+            return api_response(code=500, message=internal_error)
+        
+        code, description, key, template = handler
+        if code >= 500:
+            logger.error("%s: %s", description, e, exc_info=True)
+        else:
+            logger.warning("%s: %s", description, e)
+        try:
+            message = template.format(error=str(e))
+        except (KeyError, IndexError, ValueError):
+            # 模板含有 {error} 以外的占位符时无法预先解析，按原方式逐次获取消息
+            message = get_message(key, error=str(e))
+        return api_response(code=code, message=message)
+    return respond
+
 def handle_exceptions(
     not_found_message: str = MessageKeys.RESOURCE_NOT_FOUND,
     forbidden_message: str = MessageKeys.FORBIDDEN,
@@ -33,43 +142,22 @@ def handle_exceptions(
         internal_error_message: 500错误消息键
     """
     def decorator(func: Callable) -> Callable:
+        respond = _exception_responder(
+            not_found_message, forbidden_message, validation_message, internal_error_message
+        )
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             try:
                 return await func(*args, **kwargs)
-            except NotFoundException as e:
-                logger.warning(f"资源未找到: {str(e)}")
-                return api_response(
-                    code=404,
-                    message=get_message(not_found_message, error=str(e))
-                )
-            except AuthorizationException as e:
-                logger.warning(f"权限不足: {str(e)}")
-                return api_response(
-                    code=403,
-                    message=get_message(forbidden_message, error=str(e))
-                )
-            except ValidationException as e:
-                logger.warning(f"验证失败: {str(e)}")
-                return api_response(
-                    code=400,
-                    message=get_message(validation_message, error=str(e))
-                )
-            except ServiceException as e:
-                logger.error(f"服务错误: {str(e)}", exc_info=True)
-                return api_response(
-                    code=500,
-                    message=get_message(internal_error_message, error=str(e))
-                )
             except Exception as e:
-                logger.error(f"未知错误: {str(e)}", exc_info=True)
-                return api_response(
-                    code=500,
-                    message=get_message(internal_error_message, error="系统内部错误")
-                )
+                return respond(e)
         return wrapper
     return decorator
 
+# 不记录到请求参数中的关键字参数（请求对象、当前用户以及注入的依赖）
+_EXCLUDED_LOG_KWARGS = frozenset(('current_user', 'request', 'db', 'background_tasks'))
+
 def log_api_call(
     operation: str,
     resource_type: str = "资源",
@@ -83,77 +171,98 @@ def log_api_call(
         operation: 操作名称
         resource_type: 资源类型
         log_request: 是否记录请求参数
-        log_response: 是否记录响应数据
+        log_response: 是否记录响应数据（仅在DEBUG级别生效）
     """
     def decorator(func: Callable) -> Callable:
+        layout = _resolve_params(func)
+        messages = _ApiCallMessages.build(operation, resource_type)
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            start_time = time.time()
-            
-            # 提取请求信息
-            request = None
-            user_id = None
-            for arg in args:
-                if isinstance(arg, Request):
-                    request = arg
-                elif hasattr(arg, 'id'):  # 用户对象
-                    user_id = arg.id
-            
-            request_id = get_request_id(request) if request else None
+            start = time.perf_counter()
+            info_enabled = logger.isEnabledFor(logging.INFO)
+            log_data = _api_call_log_data(operation, resource_type, layout, args, kwargs, log_request) if info_enabled else None
             
-            # 记录请求开始
-            log_data = {
-                "operation": operation,
-                "resource_type": resource_type,
-                "user_id": user_id,
-                "request_id": request_id,
-                "start_time": start_time
-            }
-            
-            if log_request:
-                log_data["request_params"] = {
-                    k: v for k, v in kwargs.items() 
-                    if not k.startswith('_') and k not in ['current_user', 'request']
-                }
-            
-            logger.info(f"开始{operation}{resource_type}", extra=log_data)
+            if info_enabled:
+                logger.info(messages.start, extra=log_data)
             
             try:
                 # 执行函数
                 result = await func(*args, **kwargs)
-                
-                # 记录成功
-                duration = time.time() - start_time
-                success_data = {
-                    **log_data,
-                    "duration": duration,
-                    "status": "success"
-                }
-                
-                if log_response and hasattr(result, 'data'):
-                    success_data["response_data"] = result.data
-                
-                logger.info(f"完成{operation}{resource_type}", extra=success_data)
-                
-                return result
-                
             except Exception as e:
                 # 记录错误
-                duration = time.time() - start_time
-                error_data = {
-                    **log_data,
-                    "duration": duration,
-                    "status": "error",
-                    "error": str(e),
-                    "error_type": type(e).__name__
-                }
-                
-                logger.error(f"{operation}{resource_type}失败", extra=error_data)
+                if log_data is None:
+                    log_data = _api_call_log_data(operation, resource_type, layout, args, kwargs, log_request)
+                _log_api_failure(messages.failed, log_data, start, e)
                 raise
+            
+            # 记录成功
+            if info_enabled:
+                _log_api_success(messages.done, log_data, start, result, log_response)
+            
+            return result
                 
         return wrapper
     return decorator
 
+class _ApiCallMessages(NamedTuple):
+    """API调用日志的固定消息，装饰时拼接一次（无格式化参数，输出时不再做%插值）"""
+    start: str
+    done: str
+    failed: str
+
+    @classmethod
+    def build(cls, operation: str, resource_type: str) -> "_ApiCallMessages":
+        return cls(f"开始{operation}{resource_type}", f"完成{operation}{resource_type}", f"{operation}{resource_type}失败")
+
+def _api_call_log_data(
+    operation: str,
+    resource_type: str,
+    layout: _ParamLayout,
+    args: tuple,
+    kwargs: dict,
+    log_request: bool
+) -> Dict[str, Any]:
+    """构建API调用日志的结构化字段"""
+    request = _request_arg(args, kwargs, layout)
+    user = _user_arg(args, kwargs, layout)
+    user_id = getattr(user, 'id', None)
+    
+    log_data = {
+        "operation": operation,
+        "resource_type": resource_type,
+        "user_id": user_id,
+        "request_id": get_request_id(request) if request else None,
+        "start_time": time.time()
+    }
+    
+    if log_request:
+        log_data["request_params"] = {
+            k: kwargs[k] for k in kwargs.keys() - _EXCLUDED_LOG_KWARGS
+            if k[0] != '_'
+        }
+    return log_data
+
+def _log_api_failure(message: str, log_data: Dict[str, Any], start: float, e: Exception) -> None:
+    log_data["duration"] = time.perf_counter() - start
+    log_data["status"] = "error"
+    log_data["error"] = str(e)
+    log_data["error_type"] = type(e).__name__
+    logger.error(message, extra=log_data)
+
+def _log_api_success(
+    message: str,
+    log_data: Dict[str, Any],
+    start: float,
+    result: Any,
+    log_response: bool
+) -> None:
+    log_data["duration"] = time.perf_counter() - start
+    log_data["status"] = "success"
+    if log_response and hasattr(result, 'data') and logger.isEnabledFor(logging.DEBUG):
+        log_data["response_data"] = result.data
+    logger.info(message, extra=log_data)
+
 def validate_request(
     required_fields: Optional[List[str]] = None,
     optional_fields: Optional[List[str]] = None,
@@ -168,52 +277,51 @@ def validate_request(
         field_validators: 字段验证器字典
     """
     def decorator(func: Callable) -> Callable:
+        layout = _resolve_params(func)
+        required = tuple(required_fields or ())
+        validators = tuple((field_validators or {}).items())
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            # 查找请求数据
-            request_data = None
-            for arg in args:
-                if hasattr(arg, 'dict'):  # Pydantic模型
-                    request_data = arg.dict()
-                    break
+            # 查找请求数据，直接读取模型属性，无需 model_dump() 构造整个字典
+            body = _bound_arg(args, kwargs, layout.body)
             
-            if not request_data:
-                # 从kwargs中查找
-                for key, value in kwargs.items():
-                    if hasattr(value, 'dict'):
-                        request_data = value.dict()
-                        break
-            
-            if request_data:
+            if body is not None:
                 # 验证必需字段
-                if required_fields:
+                if required:
                     missing_fields = [
-                        field for field in required_fields 
-                        if field not in request_data or request_data[field] is None
+                        field for field in required
+                        if getattr(body, field, None) is None
                     ]
                     if missing_fields:
                         raise ValidationException(f"缺少必需字段: {', '.join(missing_fields)}")
                 
                 # 验证字段格式
-                if field_validators:
-                    for field, validator in field_validators.items():
-                        if field in request_data and request_data[field] is not None:
-                            try:
-                                validator(request_data[field])
-                            except Exception as e:
-                                raise ValidationException(f"字段 {field} 验证失败: {str(e)}")
+                for field, validator in validators:
+                    value = getattr(body, field, None)
+                    if value is not None:
+                        try:
+                            validator(value)
+                        except Exception as e:
+                            raise ValidationException(f"字段 {field} 验证失败: {str(e)}")
             
             return await func(*args, **kwargs)
         return wrapper
     return decorator
 
+# 正在计算中的缓存键 -> 共享结果，同一键的并发请求只执行一次被装饰函数
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+# 计算者被取消时交给等待者的结果：等待者不随之失败，而是重新检查缓存或自行计算
+_RETRY = object()
+
 def cache_response(
     ttl: int = 300,  # 缓存时间（秒）
     key_func: Optional[Callable] = None,  # 自定义缓存键函数
     condition: Optional[Callable] = None  # 缓存条件函数
 ):
     """
-    响应缓存装饰器
+    响应缓存装饰器，缓存存储由 core.cache 中的缓存后端提供
     
     Args:
         ttl: 缓存生存时间（秒）
@@ -221,7 +329,9 @@ def cache_response(
         condition: 缓存条件函数
     """
     def decorator(func: Callable) -> Callable:
-        cache = {}  # 简单内存缓存，生产环境应使用Redis
+        # 按函数区分命名空间，避免不同端点的缓存键冲突
+        key_prefix = f"{func.__module__}:{func.__qualname__}"
+        layout = _resolve_params(func)
         
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -229,58 +339,112 @@ def cache_response(
             if key_func:
                 cache_key = key_func(*args, **kwargs)
             else:
-                # 默认缓存键生成
-                key_parts = [func.__name__]
-                for arg in args:
-                    if isinstance(arg, (str, int, float)):
-                        key_parts.append(str(arg))
-                for k, v in kwargs.items():
-                    if isinstance(v, (str, int, float)):
-                        key_parts.append(f"{k}:{v}")
-                cache_key = ":".join(key_parts)
+                cache_key = _make_key(layout, args, kwargs)
+            # 按用户隔离缓存，防止不同用户之间互相读到对方的数据
+            user = _user_arg(args, kwargs, layout)
+            cache_key = f"{key_prefix}:{_user_scope(user)}:{cache_key}"
             
-            # 检查缓存
-            if cache_key in cache:
-                cached_data, cached_time = cache[cache_key]
-                if time.time() - cached_time < ttl:
-                    logger.debug(f"缓存命中: {cache_key}")
+            backend = get_cache_backend()
+            while True:
+                # 检查缓存
+                cached_data = await backend.get(cache_key)
+                if cached_data is not None:
+                    logger.debug("缓存命中: %s", cache_key)
                     return cached_data
-                else:
-                    # 缓存过期，删除
-                    del cache[cache_key]
-            
-            # 执行函数
-            result = await func(*args, **kwargs)
-            
-            # 检查是否应该缓存
-            should_cache = True
-            if condition:
-                should_cache = condition(result, *args, **kwargs)
+                
+                # 同一个键已有请求在计算时直接等待其结果，避免缓存失效瞬间的并发重复计算
+                inflight = _inflight.get(cache_key)
+                if inflight is None:
+                    break
+                result = await asyncio.shield(inflight)
+                if result is not _RETRY:
+                    return result
             
-            # 缓存结果
-            if should_cache:
-                cache[cache_key] = (result, time.time())
-                logger.debug(f"缓存存储: {cache_key}")
+            future = asyncio.get_running_loop().create_future()
+            _inflight[cache_key] = future
+            try:
+                # 执行函数
+                result = await func(*args, **kwargs)
+                
+                # 检查是否应该缓存
+                should_cache = True
+                if condition:
+                    should_cache = condition(result, *args, **kwargs)
+                
+                # 缓存结果
+                if should_cache:
+                    await backend.set(cache_key, result, ttl)
+                    logger.debug("缓存存储: %s", cache_key)
+            except asyncio.CancelledError:
+                # 计算者的取消（如客户端断开）不应传递给其他请求
+                future.set_result(_RETRY)
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # 标记异常已被读取，没有等待者时不产生 "exception was never retrieved" 警告
+                future.exception()
+                raise
+            else:
+                future.set_result(result)
+            finally:
+                _inflight.pop(cache_key, None)
             
             return result
         return wrapper
     return decorator
 
+def _key_default(obj: Any) -> Any:
+    """缓存键序列化：Pydantic模型按字段值，其余对象（服务、会话等依赖）只取类型名"""
+    if isinstance(obj, PydanticBaseModel):
+        return obj.model_dump()
+    return type(obj).__qualname__
+
+def _make_key(layout: _ParamLayout, args: tuple, kwargs: dict) -> str:
+    """默认缓存键：对参数做一次orjson序列化后计算xxhash
+    
+    请求对象和当前用户不参与哈希（用户已体现在缓存键的用户范围中），
+    关键字参数按键排序，保证参数顺序不同的调用得到相同的键。
+    """
+    skipped = [slot for slot in (layout.request, layout.user) if slot is not None]
+    skipped_positions = {position for position, _ in skipped}
+    skipped_names = {name for _, name in skipped}
+    key_args = [arg for index, arg in enumerate(args) if index not in skipped_positions]
+    key_kwargs = {k: v for k, v in kwargs.items() if k not in skipped_names}
+    payload = orjson.dumps(
+        (key_args, key_kwargs),
+        default=_key_default,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return xxhash.xxh3_64_hexdigest(payload)
+
+def _user_scope(current_user: Any) -> str:
+    """缓存键的用户范围：有当前用户时使用其ID的哈希，否则为匿名"""
+    if current_user is None:
+        return "anon"
+    return hashlib.sha1(str(current_user.id).encode()).hexdigest()[:16]
+
 def rate_limit(
     max_requests: int = 100,
     window_seconds: int = 60,
     key_func: Optional[Callable] = None
 ):
     """
-    速率限制装饰器
+    速率限制装饰器（令牌桶，允许 max_requests 的突发，平均速率为 max_requests/window_seconds）
+    
+    令牌桶状态保存在 core.cache 的缓存后端中，使用Redis时多个worker共享同一限额
     
     Args:
         max_requests: 时间窗口内最大请求数
         window_seconds: 时间窗口大小（秒）
         key_func: 自定义限制键函数
     """
+    # 令牌桶：每秒补充的令牌数，桶容量为 max_requests
+    refill_rate = max_requests / window_seconds
+    
     def decorator(func: Callable) -> Callable:
-        request_counts = {}  # 简单内存存储，生产环境应使用Redis
+        # 按函数区分命名空间，每个被装饰的端点各自限流
+        key_prefix = f"ratelimit:{func.__module__}:{func.__qualname__}"
+        layout = _resolve_params(func)
         
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -289,41 +453,41 @@ def rate_limit(
                 limit_key = key_func(*args, **kwargs)
             else:
                 # 默认使用用户ID或IP
-                limit_key = "default"
-                for arg in args:
-                    if hasattr(arg, 'id'):  # 用户对象
-                        limit_key = f"user:{arg.id}"
-                        break
-                    elif isinstance(arg, Request):  # 请求对象
-                        limit_key = f"ip:{arg.client.host}"
-                        break
-            
-            current_time = time.time()
-            
-            # 清理过期记录
-            if limit_key in request_counts:
-                request_counts[limit_key] = [
-                    timestamp for timestamp in request_counts[limit_key]
-                    if current_time - timestamp < window_seconds
-                ]
-            else:
-                request_counts[limit_key] = []
+                user = _user_arg(args, kwargs, layout)
+                request = _request_arg(args, kwargs, layout)
+                if user is not None:
+                    limit_key = f"user:{user.id}"
+                elif request is not None and request.client:
+                    limit_key = f"ip:{request.client.host}"
+                else:
+                    limit_key = "default"
             
             # 检查是否超过限制
-            if len(request_counts[limit_key]) >= max_requests:
-                logger.warning(f"速率限制触发: {limit_key}")
+            wait = await get_cache_backend().take_token(f"{key_prefix}:{limit_key}", max_requests, refill_rate)
+            if wait > 0:
+                retry_after = math.ceil(wait)
+                logger.warning("速率限制触发: %s", limit_key)
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail=f"请求过于频繁，请在 {window_seconds} 秒后重试"
+                    detail=f"请求过于频繁，请在 {retry_after} 秒后重试",
+                    headers={"Retry-After": str(retry_after)}
                 )
             
-            # 记录当前请求
-            request_counts[limit_key].append(current_time)
-            
             return await func(*args, **kwargs)
         return wrapper
     return decorator
 
+def _user_permission_set(user: Any) -> frozenset:
+    """用户权限集合，首次计算后缓存在用户对象上（用户对象为请求级别）"""
+    perm_set = getattr(user, '_perm_set', None)
+    if perm_set is None:
+        perm_set = frozenset(getattr(user, 'permissions', None) or ())
+        try:
+            object.__setattr__(user, '_perm_set', perm_set)
+        except (AttributeError, TypeError):
+            pass
+    return perm_set
+
 def require_permissions(*permissions: str):
     """
     权限检查装饰器
@@ -331,37 +495,62 @@ def require_permissions(*permissions: str):
     Args:
         permissions: 需要的权限列表
     """
+    required_set = frozenset(permissions)
+    
     def decorator(func: Callable) -> Callable:
+        layout = _resolve_params(func)
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             # 查找用户对象
-            current_user = None
-            for arg in args:
-                if hasattr(arg, 'role'):  # 用户对象
-                    current_user = arg
-                    break
-            
-            if not current_user:
-                # 从kwargs中查找
-                current_user = kwargs.get('current_user')
-            
+            current_user = _user_arg(args, kwargs, layout)
             if not current_user:
                 raise AuthorizationException("未找到用户信息")
             
             # 检查权限
-            user_permissions = getattr(current_user, 'permissions', [])
-            missing_permissions = [
-                perm for perm in permissions 
-                if perm not in user_permissions
-            ]
-            
+            missing_permissions = required_set - _user_permission_set(current_user)
             if missing_permissions:
-                raise AuthorizationException(f"缺少权限: {', '.join(missing_permissions)}")
+                raise AuthorizationException(f"缺少权限: {', '.join(sorted(missing_permissions))}")
             
             return await func(*args, **kwargs)
         return wrapper
     return decorator
 
+def _response_standardizer(
+    layout: _ParamLayout,
+    success_message: str = MessageKeys.SUCCESS,
+    created_message: str = MessageKeys.CREATED,
+    updated_message: str = MessageKeys.UPDATED,
+    deleted_message: str = MessageKeys.DELETED
+) -> Callable[[Any, tuple, dict], Any]:
+    """构建 返回值 -> 标准响应 的转换函数"""
+    # HTTP方法 -> 消息，装饰时解析一次（Starlette中的方法名已是大写）
+    default_message = get_message(success_message)
+    updated = get_message(updated_message)
+    method_messages = {
+        'POST': get_message(created_message),
+        'PUT': updated,
+        'PATCH': updated,
+        'DELETE': get_message(deleted_message),
+    }
+    
+    def standardize(result: Any, args: tuple, kwargs: dict) -> Any:
+        # 已经构造好的响应（包括流式响应）直接返回，避免重复序列化
+        if isinstance(result, Response):
+            return result
+        
+        # 如果已经是标准响应格式，直接返回
+        if hasattr(result, 'success') and hasattr(result, 'code'):
+            return result
+        
+        # 根据HTTP方法确定消息
+        request = _request_arg(args, kwargs, layout)
+        message = method_messages.get(request.method, default_message) if request else default_message
+        
+        # 标准化响应
+        return api_response(data=result, message=message)
+    return standardize
+
 def standardize_response(
     success_message: str = MessageKeys.SUCCESS,
     created_message: str = MessageKeys.CREATED,
@@ -378,36 +567,13 @@ def standardize_response(
         deleted_message: 删除成功消息键
     """
     def decorator(func: Callable) -> Callable:
+        standardize = _response_standardizer(
+            _resolve_params(func), success_message, created_message, updated_message, deleted_message
+        )
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            result = await func(*args, **kwargs)
-            
-            # 如果已经是标准响应格式，直接返回
-            if hasattr(result, 'success') and hasattr(result, 'code'):
-                return result
-            
-            # 根据HTTP方法确定消息
-            request = None
-            for arg in args:
-                if isinstance(arg, Request):
-                    request = arg
-                    break
-            
-            if request:
-                method = request.method.upper()
-                if method == 'POST':
-                    message = get_message(created_message)
-                elif method == 'PUT' or method == 'PATCH':
-                    message = get_message(updated_message)
-                elif method == 'DELETE':
-                    message = get_message(deleted_message)
-                else:
-                    message = get_message(success_message)
-            else:
-                message = get_message(success_message)
-            
-            # 标准化响应
-            return api_response(data=result, message=message)
+            return standardize(await func(*args, **kwargs), args, kwargs)
         return wrapper
     return decorator
 
@@ -432,17 +598,40 @@ def api_endpoint(
         **decorator_kwargs: 其他装饰器参数
     """
     def decorator(func: Callable) -> Callable:
-        # 应用装饰器（注意顺序）
-        decorated_func = func
-        
-        if standardize:
-            decorated_func = standardize_response()(decorated_func)
-        
-        if handle_errors:
-            decorated_func = handle_exceptions()(decorated_func)
+        if not (handle_errors or log_calls or standardize):
+            return func
         
-        if log_calls:
-            decorated_func = log_api_call(operation, resource_type)(decorated_func)
+        # 等价于 log_api_call(handle_exceptions(standardize_response(func)))，
+        # 但合并为单层包装，每个请求只产生一个协程帧
+        layout = _resolve_params(func)
+        messages = _ApiCallMessages.build(operation, resource_type)
+        respond = _exception_responder() if handle_errors else None
+        standardize_result = _response_standardizer(layout) if standardize else None
         
-        return decorated_func
-    return decorator 
\ No newline at end of file
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            log_data = None
+            if log_calls:
+                start = time.perf_counter()
+                if logger.isEnabledFor(logging.INFO):
+                    log_data = _api_call_log_data(operation, resource_type, layout, args, kwargs, True)
+                    logger.info(messages.start, extra=log_data)
+            
+            try:
+                result = await func(*args, **kwargs)
+                if standardize_result is not None:
+                    result = standardize_result(result, args, kwargs)
+            except Exception as e:
+                if respond is None:
+                    if log_calls:
+                        if log_data is None:
+                            log_data = _api_call_log_data(operation, resource_type, layout, args, kwargs, True)
+                        _log_api_failure(messages.failed, log_data, start, e)
+                    raise
+                result = respond(e)
+            
+            if log_data is not None:
+                _log_api_success(messages.done, log_data, start, result, False)
+            return result
+        return wrapper
+    return decorator
@@ -1,8 +1,11 @@
 """
 错误处理模块 - 定义自定义异常和错误处理器
 """
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 
+import orjson
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -10,6 +13,9 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from .constants import APIConstants
 
+# 无附加信息时共用的只读空字典，避免每个异常实例分配一个空dict
+_EMPTY_DETAILS: Mapping[str, Any] = MappingProxyType({})
+
 class BaseAppException(Exception):
     """应用基础异常类"""
     def __init__(
@@ -20,7 +26,7 @@ class BaseAppException(Exception):
     ):
         self.message = message
         self.status_code = status_code
-        self.details = details or {}
+        self.details: Mapping[str, Any] = details if details else _EMPTY_DETAILS
         super().__init__(self.message)
 
 class BusinessException(BaseAppException):
@@ -32,8 +38,7 @@ class ValidationException(BusinessException):
     """数据验证异常"""
     def __init__(self, message: str, field: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         if field:
-            details = details or {}
-            details["field"] = field
+            details = {**details, "field": field} if details else {"field": field}
         super().__init__(message, details)
 
 class AuthenticationException(BaseAppException):
@@ -53,11 +58,13 @@ class PermissionException(AuthorizationException):
 class NotFoundException(BaseAppException):
     """资源未找到异常"""
     def __init__(self, message: str = "资源不存在", resource_type: Optional[str] = None, resource_id: Optional[str] = None):
-        details = {}
-        if resource_type:
-            details["resource_type"] = resource_type
-        if resource_id:
-            details["resource_id"] = resource_id
+        details = None
+        if resource_type or resource_id:
+            details = {}
+            if resource_type:
+                details["resource_type"] = resource_type
+            if resource_id:
+                details["resource_id"] = resource_id
         super().__init__(message, APIConstants.HTTP_NOT_FOUND, details)
 
 class ConflictException(BaseAppException):
@@ -78,24 +85,21 @@ class ServiceException(BaseAppException):
 class ExternalServiceException(ServiceException):
     """外部服务异常"""
     def __init__(self, service_name: str, message: str = "外部服务异常", details: Optional[Dict[str, Any]] = None):
-        details = details or {}
-        details["service_name"] = service_name
+        details = {**details, "service_name": service_name} if details else {"service_name": service_name}
         super().__init__(message, details)
 
 class DatabaseException(ServiceException):
     """数据库异常"""
     def __init__(self, message: str = "数据库操作失败", operation: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
-        details = details or {}
         if operation:
-            details["operation"] = operation
+            details = {**details, "operation": operation} if details else {"operation": operation}
         super().__init__(message, details)
 
 class ConfigurationException(ServiceException):
     """配置异常"""
     def __init__(self, message: str = "配置错误", config_key: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
-        details = details or {}
         if config_key:
-            details["config_key"] = config_key
+            details = {**details, "config_key": config_key} if details else {"config_key": config_key}
         super().__init__(message, details)
 
 # 业务特定异常
@@ -149,8 +153,7 @@ class MCPServerNotFoundException(NotFoundException):
 class ToolCallException(ServiceException):
     """工具调用异常"""
     def __init__(self, tool_name: str, message: str = "工具调用失败", details: Optional[Dict[str, Any]] = None):
-        details = details or {}
-        details["tool_name"] = tool_name
+        details = {**details, "tool_name": tool_name} if details else {"tool_name": tool_name}
         super().__init__(message, details)
 
 class ChatException(ServiceException):
@@ -177,46 +180,52 @@ class UnsupportedFileTypeException(ValidationException):
             details={"file_type": file_type, "supported_types": supported_types}
         )
 
-# 异常处理器
+# 异常处理器（请求路径直接取自ASGI scope，无需构造完整的URL对象）
+
+class OrjsonResponse(JSONResponse):
+    """使用orjson序列化的JSON响应，无法直接序列化的值（如验证错误上下文中的异常对象）转为字符串，UTC时间以Z结尾"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
 
 async def base_exception_handler(request: Request, exc: BaseAppException):
     """基础异常处理器"""
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=exc.status_code,
         content={
             "success": False,
             "code": exc.status_code,
             "message": exc.message,
-            "details": exc.details,
-            "timestamp": "2024-01-01T00:00:00Z",  # 实际应用中应使用当前时间
-            "path": str(request.url.path)
+            "details": dict(exc.details),
+            "timestamp": datetime.now(timezone.utc),
+            "path": request.scope["path"]
         }
     )
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """验证异常处理器"""
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=APIConstants.HTTP_BAD_REQUEST,
         content={
             "success": False,
             "code": APIConstants.HTTP_BAD_REQUEST,
             "message": "请求参数验证失败",
             "details": {"validation_errors": exc.errors()},
-            "timestamp": "2024-01-01T00:00:00Z",
-            "path": str(request.url.path)
+            "timestamp": datetime.now(timezone.utc),
+            "path": request.scope["path"]
         }
     )
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """HTTP异常处理器"""
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=exc.status_code,
         content={
             "success": False,
             "code": exc.status_code,
             "message": exc.detail,
-            "timestamp": "2024-01-01T00:00:00Z",
-            "path": str(request.url.path)
+            "timestamp": datetime.now(timezone.utc),
+            "path": request.scope["path"]
         }
     )
 
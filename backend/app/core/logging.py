@@ -5,15 +5,22 @@
 """
 import logging
 import logging.config
+import logging.handlers
 import sys
-import json
+import copy
+import atexit
+from queue import SimpleQueue
 import re
 import traceback
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from time import perf_counter
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 from contextlib import contextmanager
 
+import orjson
+
 from .config import get_settings
 from .constants import LoggingConstants
 
@@ -23,45 +30,82 @@ settings = get_settings()
 class SensitiveDataFilter(logging.Filter):
     """敏感信息过滤器"""
     
+    # (必须出现的小写关键字, 正则, 字段类型)，关键字为None表示总是执行
     SENSITIVE_PATTERNS = [
-        (re.compile(r'password["\']?\s*[:=]\s*["\']?([^"\'}\s,]+)', re.IGNORECASE), 'password'),
-        (re.compile(r'token["\']?\s*[:=]\s*["\']?([^"\'}\s,]+)', re.IGNORECASE), 'token'),
-        (re.compile(r'api_key["\']?\s*[:=]\s*["\']?([^"\'}\s,]+)', re.IGNORECASE), 'api_key'),
-        (re.compile(r'secret["\']?\s*[:=]\s*["\']?([^"\'}\s,]+)', re.IGNORECASE), 'secret'),
-        (re.compile(r'authorization:\s*bearer\s+([^\s]+)', re.IGNORECASE), 'auth_token'),
-        (re.compile(r'(\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4})', re.IGNORECASE), 'card_number'),
+        ('password', re.compile(r'password["\']?\s*[:=]\s*["\']?([^"\'}\s,]+)', re.IGNORECASE), 'password'),
+        ('token', re.compile(r'token["\']?\s*[:=]\s*["\']?([^"\'}\s,]+)', re.IGNORECASE), 'token'),
+        ('api_key', re.compile(r'api_key["\']?\s*[:=]\s*["\']?([^"\'}\s,]+)', re.IGNORECASE), 'api_key'),
+        ('secret', re.compile(r'secret["\']?\s*[:=]\s*["\']?([^"\'}\s,]+)', re.IGNORECASE), 'secret'),
+        ('authorization', re.compile(r'authorization:\s*bearer\s+([^\s]+)', re.IGNORECASE), 'auth_token'),
+        (None, re.compile(r'(\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4})', re.IGNORECASE), 'card_number'),
     ]
     
     def filter(self, record):
-        """过滤敏感信息"""
-        if hasattr(record, 'msg'):
-            record.msg = self._mask_sensitive_data(str(record.msg))
-        
-        if hasattr(record, 'args') and record.args:
-            record.args = tuple(
-                self._mask_sensitive_data(str(arg)) if isinstance(arg, str) else arg
-                for arg in record.args
-            )
-        
+        """过滤敏感信息（可选：需要在格式化之前脱敏的处理器才挂载，默认由格式化器脱敏）"""
+        # 先格式化再脱敏，避免模板中的 %s 被替换后与参数不匹配
+        record.msg = _masked_message(record)
+        record.args = ()
         return True
     
     def _mask_sensitive_data(self, text: str) -> str:
         """脱敏敏感数据"""
-        for pattern, field_type in self.SENSITIVE_PATTERNS:
-            text = pattern.sub(lambda m: f'{field_type}=***masked***', text)
+        # 先用小写子串判断关键字是否出现，绝大多数日志不含关键字，可跳过对应正则的整串扫描
+        lowered = text.lower()
+        for keyword, pattern, field_type in self.SENSITIVE_PATTERNS:
+            if keyword is None or keyword in lowered:
+                text = pattern.sub(f'{field_type}=***masked***', text)
         return text
 
 
+_SENSITIVE_FILTER = SensitiveDataFilter()
+
+
+def _masked_message(record: logging.LogRecord) -> str:
+    """记录的脱敏消息，同一条记录经过多个处理器时只计算一次"""
+    message = record.__dict__.get('_masked_message')
+    if message is None:
+        message = _SENSITIVE_FILTER._mask_sensitive_data(record.getMessage())
+        record._masked_message = message
+    return message
+
+
+class SensitiveDataFormatter(logging.Formatter):
+    """脱敏格式化器 - 处理器只对实际输出的记录调用格式化，低于级别的记录不做脱敏"""
+    
+    def formatMessage(self, record):
+        record.message = _masked_message(record)
+        return super().formatMessage(record)
+
+
+def _exception_entry(record: logging.LogRecord) -> Dict[str, Any]:
+    """记录的异常信息，同一条记录被多个结构化处理器输出时只格式化一次堆栈"""
+    entry = record.__dict__.get('_exception_entry')
+    if entry is None:
+        exc_type, exc_value, exc_tb = record.exc_info
+        entry = {
+            'type': exc_type.__name__,
+            'message': str(exc_value),
+            'traceback': traceback.format_exception(exc_type, exc_value, exc_tb)
+        }
+        record._exception_entry = entry
+    return entry
+
+
 class StructuredFormatter(logging.Formatter):
     """结构化日志格式化器"""
     
+    def __init__(self, *args, mask_message: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 结构化字段本身不做脱敏扫描；仅内容可控的日志（如性能指标）可关闭消息脱敏
+        self.mask_message = mask_message
+    
     def format(self, record):
         """格式化日志记录"""
         log_entry = {
-            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+            'timestamp': datetime.fromtimestamp(record.created),  # orjson原生序列化为ISO格式
             'level': record.levelname,
             'logger': record.name,
-            'message': record.getMessage(),
+            'message': _masked_message(record) if self.mask_message else record.getMessage(),
             'module': record.module,
             'function': record.funcName,
             'line': record.lineno,
@@ -73,18 +117,14 @@ class StructuredFormatter(logging.Formatter):
         
         # 添加异常信息
         if record.exc_info:
-            log_entry['exception'] = {
-                'type': record.exc_info[0].__name__,
-                'message': str(record.exc_info[1]),
-                'traceback': traceback.format_exception(*record.exc_info)
-            }
+            log_entry['exception'] = _exception_entry(record)
         
         # 添加请求上下文（如果存在）
         for attr in ['request_id', 'user_id', 'session_id', 'trace_id']:
             if hasattr(record, attr):
                 log_entry[attr] = getattr(record, attr)
         
-        return json.dumps(log_entry, ensure_ascii=False, default=str)
+        return orjson.dumps(log_entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
 
 def get_logging_config() -> Dict[str, Any]:
@@ -98,16 +138,22 @@ def get_logging_config() -> Dict[str, Any]:
         "disable_existing_loggers": False,
         "formatters": {
             "default": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s",
+                "()": SensitiveDataFormatter,
+                "fmt": "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s",
                 "datefmt": "%Y-%m-%d %H:%M:%S",
             },
             "detailed": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s",
+                "()": SensitiveDataFormatter,
+                "fmt": "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s",
                 "datefmt": "%Y-%m-%d %H:%M:%S",
             },
             "structured": {
                 "()": StructuredFormatter,
             },
+            "performance": {
+                "()": StructuredFormatter,
+                "mask_message": False,
+            },
         },
         "filters": {
             "sensitive_filter": {
@@ -120,7 +166,6 @@ def get_logging_config() -> Dict[str, Any]:
                 "level": log_level,
                 "formatter": "default",
                 "stream": sys.stdout,
-                "filters": ["sensitive_filter"],
             },
             "file": {
                 "class": "logging.handlers.RotatingFileHandler",
@@ -130,7 +175,6 @@ def get_logging_config() -> Dict[str, Any]:
                 "maxBytes": LoggingConstants.MAX_LOG_FILE_SIZE,
                 "backupCount": LoggingConstants.LOG_BACKUP_COUNT,
                 "encoding": "utf-8",
-                "filters": ["sensitive_filter"],
             },
             "error_file": {
                 "class": "logging.handlers.RotatingFileHandler",
@@ -140,7 +184,6 @@ def get_logging_config() -> Dict[str, Any]:
                 "maxBytes": LoggingConstants.MAX_LOG_FILE_SIZE,
                 "backupCount": LoggingConstants.LOG_BACKUP_COUNT,
                 "encoding": "utf-8",
-                "filters": ["sensitive_filter"],
             },
             "structured_file": {
                 "class": "logging.handlers.RotatingFileHandler",
@@ -150,12 +193,11 @@ def get_logging_config() -> Dict[str, Any]:
                 "maxBytes": LoggingConstants.MAX_LOG_FILE_SIZE,
                 "backupCount": LoggingConstants.LOG_BACKUP_COUNT,
                 "encoding": "utf-8",
-                "filters": ["sensitive_filter"],
             },
             "performance_file": {
                 "class": "logging.handlers.RotatingFileHandler",
                 "level": "INFO",
-                "formatter": "structured",
+                "formatter": "performance",
                 "filename": log_dir / "performance.log",
                 "maxBytes": LoggingConstants.MAX_LOG_FILE_SIZE,
                 "backupCount": LoggingConstants.LOG_BACKUP_COUNT,
@@ -209,10 +251,68 @@ def get_logging_config() -> Dict[str, Any]:
     return config
 
 
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """进程内队列处理器：入队前只确定消息文本，保留异常信息与结构化字段，由后台线程中的文件处理器格式化"""
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        # 立即插值，避免参数对象在后台线程格式化前被修改
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# 后台写文件的监听线程，以及被替换的 (logger, 队列处理器, 原文件处理器)
+_queue_listeners: List[logging.handlers.QueueListener] = []
+_queued_loggers: List[Tuple[logging.Logger, logging.Handler, Tuple[logging.Handler, ...]]] = []
+
+
+def _move_file_handlers_to_queue(logger_names: List[str]) -> None:
+    """把各logger上的文件处理器换成队列处理器，磁盘写入与日志轮转移到后台线程，不阻塞事件循环"""
+    # 文件处理器组合相同的logger共用一个队列
+    queue_handlers: Dict[Tuple[logging.Handler, ...], logging.Handler] = {}
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        file_handlers = tuple(h for h in logger.handlers if isinstance(h, logging.FileHandler))
+        if not file_handlers:
+            continue
+        
+        queue_handler = queue_handlers.get(file_handlers)
+        if queue_handler is None:
+            queue_handler = _LocalQueueHandler(SimpleQueue())
+            listener = logging.handlers.QueueListener(
+                queue_handler.queue, *file_handlers, respect_handler_level=True
+            )
+            listener.start()
+            _queue_listeners.append(listener)
+            queue_handlers[file_handlers] = queue_handler
+        
+        for handler in file_handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        _queued_loggers.append((logger, queue_handler, file_handlers))
+
+
+def shutdown_logging() -> None:
+    """停止后台日志线程并写完队列中剩余的日志，之后的日志恢复为直接写文件"""
+    while _queued_loggers:
+        logger, queue_handler, file_handlers = _queued_loggers.pop()
+        logger.removeHandler(queue_handler)
+        for handler in file_handlers:
+            logger.addHandler(handler)
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+
+atexit.register(shutdown_logging)
+
+
 def setup_logging() -> None:
     """设置日志配置"""
+    shutdown_logging()
     config = get_logging_config()
     logging.config.dictConfig(config)
+    _move_file_handlers_to_queue(list(config["loggers"]))
     
     # 禁用第三方库的调试日志以避免格式化错误
     logging.getLogger("pdfminer").setLevel(logging.WARNING)
@@ -262,12 +362,24 @@ def get_performance_logger() -> logging.Logger:
 class LoggerMixin:
     """Logger Mixin类，为其他类提供日志功能"""
     
+    _logger: logging.Logger
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 每个子类在定义时解析一次logger，访问时不再拼接名称
+        module_name = cls.__module__.replace("app.", "")
+        cls._logger = get_logger(f"{module_name}.{cls.__name__}")
+    
     @property
     def logger(self) -> logging.Logger:
         """获取当前类的logger"""
-        class_name = self.__class__.__name__
-        module_name = self.__class__.__module__.replace("app.", "")
-        return get_logger(f"{module_name}.{class_name}")
+        return self._logger
+
+
+# 按状态码百位数确定响应日志级别：4xx为警告，5xx为错误，其余为信息
+_STATUS_LEVELS = (
+    logging.INFO, logging.INFO, logging.INFO, logging.INFO, logging.WARNING, logging.ERROR
+)
 
 
 class StructuredLogger:
@@ -279,11 +391,9 @@ class StructuredLogger:
     
     def log_with_context(self, level: int, message: str, **context) -> None:
         """带上下文的日志记录"""
-        extra_data = {
-            'event_type': context.pop('event_type', 'general'),
-            **context
-        }
-        self.logger.log(level, message, extra={'extra_data': extra_data})
+        # context 是本次调用的关键字参数字典，可直接作为结构化数据使用
+        context.setdefault('event_type', 'general')
+        self.logger.log(level, message, extra={'extra_data': context})
     
     def info(self, message: str, **context) -> None:
         """记录信息日志"""
@@ -303,6 +413,8 @@ class StructuredLogger:
     
     def log_request(self, method: str, path: str, user_id: str = None, **kwargs) -> None:
         """记录请求日志"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.info(
             f"请求开始: {method} {path}",
             event_type="request_start",
@@ -314,18 +426,9 @@ class StructuredLogger:
     
     def log_response(self, status_code: int, duration: float, **kwargs) -> None:
         """记录响应日志"""
-        level_map = {
-            range(200, 300): logging.INFO,
-            range(300, 400): logging.INFO,
-            range(400, 500): logging.WARNING,
-            range(500, 600): logging.ERROR,
-        }
-        
-        level = logging.INFO
-        for status_range, log_level in level_map.items():
-            if status_code in status_range:
-                level = log_level
-                break
+        level = _STATUS_LEVELS[status_code // 100] if 0 <= status_code < 600 else logging.INFO
+        if not self.logger.isEnabledFor(level):
+            return
         
         self.log_with_context(
             level,
@@ -338,6 +441,8 @@ class StructuredLogger:
     
     def log_database_operation(self, operation: str, table: str, duration: float = None, **kwargs) -> None:
         """记录数据库操作日志"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         message = f"数据库操作: {operation} {table}"
         if duration:
             message += f" - 耗时: {duration*1000:.1f}ms"
@@ -353,16 +458,18 @@ class StructuredLogger:
     
     def log_external_api_call(self, service: str, endpoint: str, status_code: int = None, duration: float = None, **kwargs) -> None:
         """记录外部API调用日志"""
+        level = logging.INFO
+        if status_code and status_code >= 400:
+            level = logging.WARNING if status_code < 500 else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        
         message = f"外部API调用: {service} {endpoint}"
         if status_code:
             message += f" - 状态: {status_code}"
         if duration:
             message += f" - 耗时: {duration*1000:.1f}ms"
         
-        level = logging.INFO
-        if status_code and status_code >= 400:
-            level = logging.WARNING if status_code < 500 else logging.ERROR
-        
         self.log_with_context(
             level,
             message,
@@ -376,6 +483,8 @@ class StructuredLogger:
     
     def log_business_event(self, event: str, entity_type: str = None, entity_id: str = None, **kwargs) -> None:
         """记录业务事件日志"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         message = f"业务事件: {event}"
         if entity_type and entity_id:
             message += f" - {entity_type}:{entity_id}"
@@ -391,6 +500,8 @@ class StructuredLogger:
     
     def log_performance_metric(self, metric_name: str, value: float, unit: str = None, **kwargs) -> None:
         """记录性能指标"""
+        if not self.performance_logger.isEnabledFor(logging.INFO):
+            return
         message = f"性能指标: {metric_name} = {value}"
         if unit:
             message += f" {unit}"
@@ -410,16 +521,22 @@ class StructuredLogger:
     
     def log_error(self, error: Exception, context: Dict[str, Any] = None, **kwargs) -> None:
         """记录错误日志"""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        
+        error_type = type(error).__name__
+        error_message = str(error)
         error_context = {
             'event_type': 'error',
-            'error_type': type(error).__name__,
-            'error_message': str(error),
-            **(context or {}),
-            **kwargs
+            'error_type': error_type,
+            'error_message': error_message,
         }
+        if context:
+            error_context.update(context)
+        error_context.update(kwargs)
         
         self.logger.error(
-            f"错误发生: {type(error).__name__}: {str(error)}",
+            f"错误发生: {error_type}: {error_message}",
             exc_info=True,
             extra={'extra_data': error_context}
         )
@@ -428,12 +545,12 @@ class StructuredLogger:
 @contextmanager
 def log_operation(logger: StructuredLogger, operation: str, **context):
     """操作日志上下文管理器"""
-    start_time = datetime.now()
+    start = perf_counter()
     logger.info(f"开始操作: {operation}", event_type="operation_start", operation=operation, **context)
     
     try:
         yield
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = perf_counter() - start
         logger.info(
             f"操作完成: {operation} - 耗时: {duration*1000:.1f}ms",
             event_type="operation_end",
@@ -443,7 +560,7 @@ def log_operation(logger: StructuredLogger, operation: str, **context):
             **context
         )
     except Exception as e:
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = perf_counter() - start
         logger.error(
             f"操作失败: {operation} - 耗时: {duration*1000:.1f}ms - 错误: {str(e)}",
             event_type="operation_end",
@@ -464,26 +581,55 @@ service_logger = StructuredLogger("service")
 repository_logger = StructuredLogger("repository")
 
 
+_DEFAULT_MASK_FIELDS = ('password', 'token', 'api_key', 'secret', 'authorization')
+
+
+@lru_cache(maxsize=32)
+def _mask_spec(fields: Tuple[str, ...]) -> Tuple[frozenset, tuple]:
+    """按字段列表预编译脱敏规则：(小写字段集合, ((小写关键字, 正则, 替换文本), ...))"""
+    lowered_fields = frozenset(field.lower() for field in fields)
+    patterns = tuple(
+        (
+            field.lower(),
+            re.compile(f'{field}["\']?\\s*[:=]\\s*["\']?([^"\'}}\\s,]+)', re.IGNORECASE),
+            f'{field}=***masked***'
+        )
+        for field in fields
+    )
+    return lowered_fields, patterns
+
+
 def mask_sensitive_data(data: Union[str, dict], fields: list = None) -> Union[str, dict]:
-    """脱敏敏感数据的工具函数"""
-    if fields is None:
-        fields = ['password', 'token', 'api_key', 'secret', 'authorization']
+    """脱敏敏感数据的工具函数（没有需要脱敏的内容时原样返回输入，不复制）"""
+    spec = _mask_spec(tuple(fields) if fields is not None else _DEFAULT_MASK_FIELDS)
+    return _mask_value(data, spec)
+
+
+def _mask_value(data: Any, spec: Tuple[frozenset, tuple]) -> Any:
+    lowered_fields, patterns = spec
     
     if isinstance(data, str):
-        for field in fields:
-            pattern = re.compile(f'{field}["\']?\\s*[:=]\\s*["\']?([^"\'}}\\s,]+)', re.IGNORECASE)
-            data = pattern.sub(f'{field}=***masked***', data)
+        # 关键字未出现时跳过对应正则；无匹配时 sub 返回原字符串对象
+        lowered = data.lower()
+        for keyword, pattern, replacement in patterns:
+            if keyword in lowered:
+                data = pattern.sub(replacement, data)
         return data
     
     elif isinstance(data, dict):
-        masked_data = {}
+        # 只有在某个值确实被替换时才复制字典
+        masked_data = None
         for key, value in data.items():
-            if key.lower() in [f.lower() for f in fields]:
-                masked_data[key] = '***masked***'
+            if key.lower() in lowered_fields:
+                masked = '***masked***'
             elif isinstance(value, (dict, str)):
-                masked_data[key] = mask_sensitive_data(value, fields)
+                masked = _mask_value(value, spec)
             else:
-                masked_data[key] = value
-        return masked_data
+                continue
+            if masked is not value:
+                if masked_data is None:
+                    masked_data = dict(data)
+                masked_data[key] = masked
+        return data if masked_data is None else masked_data
     
-    return data 
\ No newline at end of file
+    return data
@@ -3,75 +3,160 @@
 """
 import json
 import os
-from typing import Dict, Any, Optional
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Set, Tuple
 from enum import Enum
 
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# 消息文件默认目录
+_MESSAGES_DIR = os.path.join(os.path.dirname(__file__), "..", "config", "messages")
+
+# 检查消息文件修改时间的最小间隔（秒），间隔内的 get() 不访问文件系统
+_RELOAD_CHECK_INTERVAL = 2.0
+
 class Language(str, Enum):
     """支持的语言"""
     ZH_CN = "zh_CN"
     EN_US = "en_US"
 
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """将嵌套字典展开为以点号连接的单层键（如 "common.success"）"""
+    flat: Dict[str, Any] = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+@lru_cache(maxsize=2048)
+def _format_message(message: str, kwargs_items: Tuple[Tuple[str, Any], ...]) -> str:
+    """格式化消息模板，相同模板与参数的结果会被缓存"""
+    return message.format(**dict(kwargs_items))
+
+
 class MessageManager:
     """消息管理器"""
     
-    def __init__(self, default_language: Language = Language.ZH_CN):
+    def __init__(self, default_language: Language = Language.ZH_CN, messages_dir: Optional[str] = None):
         self.default_language = default_language
-        self.messages: Dict[str, Dict[str, str]] = {}
-        self._load_messages()
+        self.messages_dir = messages_dir or _MESSAGES_DIR
+        # 语言 -> 展开后的 {"common.success": "..."}，查找只需一次 dict.get；
+        # None 表示该语言尚未加载，首次使用时再读取文件
+        self.messages: Dict[str, Optional[Dict[str, Any]]] = {lang.value: None for lang in Language}
+        # 已加载消息对应的文件修改时间，以及下次检查修改时间的时刻
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._next_check: Dict[str, float] = {}
+        self._refreshing: Set[str] = set()
+        self._load_lock = threading.Lock()
     
-    def _load_messages(self):
-        """加载消息文件"""
-        messages_dir = os.path.join(os.path.dirname(__file__), "..", "config", "messages")
-        
-        for language in Language:
-            message_file = os.path.join(messages_dir, f"{language.value}.json")
-            try:
-                if os.path.exists(message_file):
-                    with open(message_file, 'r', encoding='utf-8') as f:
-                        self.messages[language.value] = json.load(f)
-                else:
-                    logger.warning(f"消息文件不存在: {message_file}")
-                    self.messages[language.value] = {}
-            except Exception as e:
-                logger.error(f"加载消息文件失败 {message_file}: {str(e)}")
-                self.messages[language.value] = {}
+    def _ensure_loaded(self, language: str) -> Dict[str, Any]:
+        """确保指定语言的消息已加载，返回展开后的消息字典"""
+        messages = self.messages.get(language)
+        if messages is not None:
+            now = time.monotonic()
+            if now >= self._next_check[language]:
+                self._revalidate(language, now)
+            return messages
+        with self._load_lock:
+            # 并发的首次请求只读取一次文件
+            if self.messages.get(language) is None:
+                self._mtimes[language] = self._file_mtime(language)
+                self.messages[language] = self._load_messages(language)
+                self._next_check[language] = time.monotonic() + _RELOAD_CHECK_INTERVAL
+            return self.messages[language]
+    
+    def _revalidate(self, language: str, now: float) -> None:
+        """消息文件修改后在后台线程重新加载，加载完成前继续使用旧消息（stale-while-revalidate）"""
+        with self._load_lock:
+            if now < self._next_check[language] or language in self._refreshing:
+                return
+            self._next_check[language] = now + _RELOAD_CHECK_INTERVAL
+            mtime = self._file_mtime(language)
+            if mtime == self._mtimes[language]:
+                return
+            self._refreshing.add(language)
+        threading.Thread(
+            target=self._reload, args=(language, mtime), name=f"messages-reload-{language}", daemon=True
+        ).start()
+    
+    def _reload(self, language: str, mtime: Optional[int]) -> None:
+        """重新读取消息文件并替换，读取失败时保留旧消息"""
+        try:
+            messages = self._read_messages(language)
+        except Exception as e:
+            logger.error("重新加载消息文件失败 %s: %s", language, e)
+            messages = None
+        with self._load_lock:
+            if messages is not None:
+                self.messages[language] = messages
+                self._mtimes[language] = mtime
+                logger.info("消息文件已重新加载: %s", language)
+            self._refreshing.discard(language)
+    
+    def _message_file(self, language: str) -> str:
+        return os.path.join(self.messages_dir, f"{language}.json")
+    
+    def _file_mtime(self, language: str) -> Optional[int]:
+        """消息文件的修改时间（纳秒），文件不存在时为None"""
+        try:
+            return os.stat(self._message_file(language)).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _read_messages(self, language: str) -> Dict[str, Any]:
+        """读取并展开消息文件，失败时抛出异常"""
+        with open(self._message_file(language), 'r', encoding='utf-8') as f:
+            return _flatten(json.load(f))
+    
+    def _load_messages(self, language: str) -> Dict[str, Any]:
+        """加载指定语言的消息文件"""
+        message_file = self._message_file(language)
+        try:
+            if os.path.exists(message_file):
+                return self._read_messages(language)
+            logger.warning("消息文件不存在: %s", message_file)
+        except Exception as e:
+            logger.error("加载消息文件失败 %s: %s", message_file, e)
+        return {}
     
     def get(self, key: str, language: Optional[Language] = None, **kwargs) -> str:
         """获取消息"""
         lang = language or self.default_language
         
-        # 处理嵌套键（如 "common.success"）
-        def get_nested_value(data: dict, key_path: str):
-            keys = key_path.split('.')
-            value = data
-            for k in keys:
-                if isinstance(value, dict) and k in value:
-                    value = value[k]
-                else:
-                    return None
-            return value
-        
         # 尝试获取指定语言的消息
-        message = get_nested_value(self.messages.get(lang.value, {}), key)
+        message = self._ensure_loaded(lang.value).get(key)
         
         # 如果没有找到，尝试默认语言
         if not message and lang != self.default_language:
-            message = get_nested_value(self.messages.get(self.default_language.value, {}), key)
+            message = self._ensure_loaded(self.default_language.value).get(key)
         
         # 如果还是没有找到，返回key本身
         if not message:
-            logger.warning(f"消息键未找到: {key}")
+            logger.warning("消息键未找到: %s", key)
             return key
         
+        # 无参数且不含占位符时无需格式化
+        if not kwargs and "{" not in message:
+            return message
+        
         # 格式化消息
         try:
-            return message.format(**kwargs)
+            try:
+                return _format_message(message, tuple(sorted(kwargs.items())))
+            except TypeError:
+                # 参数不可哈希时不走缓存
+                return message.format(**kwargs)
         except Exception as e:
-            logger.error(f"消息格式化失败 {key}: {str(e)}")
+            logger.error("消息格式化失败 %s: %s", key, e)
             return message
 
 # 全局消息管理器实例
@@ -100,6 +185,11 @@ class MessageKeys:
     FORBIDDEN = "common.forbidden"
     BAD_REQUEST = "common.bad_request"
     INTERNAL_ERROR = "common.internal_error"
+    CREATED = "common.created"
+    UPDATED = "common.updated"
+    DELETED = "common.deleted"
+    RESOURCE_NOT_FOUND = NOT_FOUND
+    VALIDATION_ERROR = BAD_REQUEST
     
     # 认证相关
     AUTH_LOGIN_SUCCESS = "auth.login_success"
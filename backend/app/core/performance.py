@@ -2,13 +2,16 @@
 性能监控模块 - 提供API性能监控和优化功能
 """
 import time
+import itertools
 import psutil
 import asyncio
-from typing import Dict, List, Optional, Any, Callable
-from collections import defaultdict, deque
+import numpy as np
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from collections import deque
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
+from functools import wraps
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -18,7 +21,13 @@ from .constants import APIConstants
 
 logger = get_logger(__name__)
 
-@dataclass
+# 系统资源（内存、CPU、进程RSS）的采样间隔（秒），请求路径上只读取缓存值
+_SYSTEM_SAMPLE_INTERVAL = 1.0
+
+# 端点键：(method, path)，避免每个请求拼接字符串
+EndpointKey = Tuple[str, str]
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """性能指标"""
     request_count: int = 0
@@ -41,7 +50,7 @@ class PerformanceMetrics:
         """错误率"""
         return self.error_count / self.request_count if self.request_count > 0 else 0.0
 
-@dataclass
+@dataclass(slots=True)
 class RequestMetrics:
     """单个请求的性能指标"""
     method: str
@@ -50,9 +59,40 @@ class RequestMetrics:
     response_time: float
     memory_before: float
     memory_after: float
-    timestamp: datetime
+    ts_ns: int  # time.time_ns()，需要展示时再转换为 datetime
     user_id: Optional[str] = None
     request_id: Optional[str] = None
+    
+    @property
+    def timestamp(self) -> datetime:
+        """请求完成时间"""
+        return datetime.fromtimestamp(self.ts_ns / 1e9)
+
+@dataclass(slots=True, frozen=True)
+class Alert:
+    """性能告警"""
+    type: str
+    value: float
+    threshold: float
+    ts_ns: int
+    endpoint: Optional[str] = None  # 系统级告警没有端点
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        data = {'type': self.type}
+        if self.endpoint is not None:
+            data['endpoint'] = self.endpoint
+        data.update(
+            value=self.value,
+            threshold=self.threshold,
+            ts_ns=self.ts_ns,
+            timestamp=datetime.fromtimestamp(self.ts_ns / 1e9).isoformat()
+        )
+        return data
+
+def format_endpoint(endpoint_key: EndpointKey) -> str:
+    """将端点键格式化为 "METHOD /path" 用于展示"""
+    return f"{endpoint_key[0]} {endpoint_key[1]}"
 
 class PerformanceMonitor:
     """性能监控器"""
@@ -60,9 +100,23 @@ class PerformanceMonitor:
     def __init__(self, max_history: int = 1000):
         self.max_history = max_history
         self.metrics_history: deque = deque(maxlen=max_history)
-        self.endpoint_metrics: Dict[str, PerformanceMetrics] = defaultdict(PerformanceMetrics)
+        self.endpoint_metrics: Dict[EndpointKey, PerformanceMetrics] = {}
         self.request_history: deque = deque(maxlen=max_history)
-        self.alerts: List[Dict[str, Any]] = []
+        # 聚合用的环形缓冲区（按列存储），与 request_history 同步写入
+        self._rt = np.empty(max_history, dtype=np.float64)
+        self._status = np.empty(max_history, dtype=np.int16)
+        self._ts_ns = np.empty(max_history, dtype=np.int64)
+        self._head = 0
+        self._count = 0
+        # 告警按时间顺序追加，只保留最近的 max_history 条
+        self.alerts: deque = deque(maxlen=max_history)
+        # 正在处理中的请求数（仅在事件循环中增减，无需加锁）
+        self.active_requests: int = 0
+        self._proc = psutil.Process()
+        self._sampled_at = float('-inf')
+        self._mem_pct = 0.0
+        self._cpu_pct = 0.0
+        self._rss_mb = 0.0
         self.thresholds = {
             'response_time': 2.0,  # 2秒
             'error_rate': 0.05,    # 5%
@@ -70,13 +124,40 @@ class PerformanceMonitor:
             'cpu_usage': 0.8       # 80%
         }
     
+    def _sample_system(self) -> None:
+        """按采样间隔刷新系统资源使用情况，间隔内直接使用缓存值"""
+        now = time.monotonic()
+        if now - self._sampled_at < _SYSTEM_SAMPLE_INTERVAL:
+            return
+        self._sampled_at = now
+        self._mem_pct = psutil.virtual_memory().percent / 100
+        self._cpu_pct = psutil.cpu_percent() / 100
+        self._rss_mb = self._proc.memory_info().rss / 1024 / 1024
+        self._check_system_thresholds()
+    
+    @property
+    def process_memory_mb(self) -> float:
+        """当前进程占用内存（MB，采样值）"""
+        self._sample_system()
+        return self._rss_mb
+    
     def record_request(self, request_metrics: RequestMetrics) -> None:
         """记录请求指标"""
         self.request_history.append(request_metrics)
         
+        i = self._head
+        self._rt[i] = request_metrics.response_time
+        self._status[i] = request_metrics.status_code
+        self._ts_ns[i] = request_metrics.ts_ns
+        self._head = (i + 1) % self.max_history
+        if self._count < self.max_history:
+            self._count += 1
+        
         # 更新端点指标
-        endpoint_key = f"{request_metrics.method} {request_metrics.path}"
-        endpoint_metric = self.endpoint_metrics[endpoint_key]
+        endpoint_key = (request_metrics.method, request_metrics.path)
+        endpoint_metric = self.endpoint_metrics.get(endpoint_key)
+        if endpoint_metric is None:
+            endpoint_metric = self.endpoint_metrics[endpoint_key] = PerformanceMetrics()
         
         endpoint_metric.request_count += 1
         endpoint_metric.total_response_time += request_metrics.response_time
@@ -97,115 +178,136 @@ class PerformanceMonitor:
     
     def _check_thresholds(
         self, 
-        endpoint_key: str, 
+        endpoint_key: EndpointKey, 
         endpoint_metric: PerformanceMetrics,
         request_metrics: RequestMetrics
     ) -> None:
-        """检查性能阈值并生成告警"""
-        alerts = []
+        """检查请求级性能阈值并生成告警"""
+        alerts: List[Alert] = []
         
         # 响应时间告警
         if request_metrics.response_time > self.thresholds['response_time']:
-            alerts.append({
-                'type': 'high_response_time',
-                'endpoint': endpoint_key,
-                'value': request_metrics.response_time,
-                'threshold': self.thresholds['response_time'],
-                'timestamp': datetime.now()
-            })
+            alerts.append(Alert(
+                type='high_response_time',
+                endpoint=format_endpoint(endpoint_key),
+                value=request_metrics.response_time,
+                threshold=self.thresholds['response_time'],
+                ts_ns=request_metrics.ts_ns
+            ))
         
         # 错误率告警
         if endpoint_metric.error_rate > self.thresholds['error_rate']:
-            alerts.append({
-                'type': 'high_error_rate',
-                'endpoint': endpoint_key,
-                'value': endpoint_metric.error_rate,
-                'threshold': self.thresholds['error_rate'],
-                'timestamp': datetime.now()
-            })
+            alerts.append(Alert(
+                type='high_error_rate',
+                endpoint=format_endpoint(endpoint_key),
+                value=endpoint_metric.error_rate,
+                threshold=self.thresholds['error_rate'],
+                ts_ns=request_metrics.ts_ns
+            ))
+        
+        self._record_alerts(alerts)
+    
+    def _check_system_thresholds(self) -> None:
+        """检查系统资源阈值，每次采样只检查一次，而不是每个请求都检查"""
+        alerts: List[Alert] = []
+        ts_ns = time.time_ns()
         
         # 内存使用告警
-        memory_usage = psutil.virtual_memory().percent / 100
+        memory_usage = self._mem_pct
         if memory_usage > self.thresholds['memory_usage']:
-            alerts.append({
-                'type': 'high_memory_usage',
-                'value': memory_usage,
-                'threshold': self.thresholds['memory_usage'],
-                'timestamp': datetime.now()
-            })
+            alerts.append(Alert(
+                type='high_memory_usage',
+                value=memory_usage,
+                threshold=self.thresholds['memory_usage'],
+                ts_ns=ts_ns
+            ))
         
         # CPU使用告警
-        cpu_usage = psutil.cpu_percent() / 100
+        cpu_usage = self._cpu_pct
         if cpu_usage > self.thresholds['cpu_usage']:
-            alerts.append({
-                'type': 'high_cpu_usage',
-                'value': cpu_usage,
-                'threshold': self.thresholds['cpu_usage'],
-                'timestamp': datetime.now()
-            })
+            alerts.append(Alert(
+                type='high_cpu_usage',
+                value=cpu_usage,
+                threshold=self.thresholds['cpu_usage'],
+                ts_ns=ts_ns
+            ))
         
-        # 记录告警
+        self._record_alerts(alerts)
+    
+    def _record_alerts(self, alerts: List[Alert]) -> None:
+        """记录告警"""
         for alert in alerts:
             self.alerts.append(alert)
-            logger.warning(f"性能告警: {alert}")
+            logger.warning("性能告警: %s", alert)
+    
+    def _ordered(self, column: np.ndarray) -> np.ndarray:
+        """按写入顺序（从旧到新）返回环形缓冲区中的有效数据"""
+        if self._count < self.max_history:
+            return column[:self._count]
+        return np.concatenate((column[self._head:], column[:self._head]))
     
     def get_overall_metrics(self, time_window: Optional[timedelta] = None) -> PerformanceMetrics:
         """获取整体性能指标"""
+        response_times = self._ordered(self._rt)
+        status_codes = self._ordered(self._status)
         if time_window:
-            cutoff_time = datetime.now() - time_window
-            requests = [
-                req for req in self.request_history 
-                if req.timestamp >= cutoff_time
-            ]
-        else:
-            requests = list(self.request_history)
+            cutoff_ns = time.time_ns() - int(time_window.total_seconds() * 1e9)
+            start = np.searchsorted(self._ordered(self._ts_ns), cutoff_ns)
+            response_times = response_times[start:]
+            status_codes = status_codes[start:]
         
-        if not requests:
+        if not len(response_times):
             return PerformanceMetrics()
         
         metrics = PerformanceMetrics()
-        metrics.request_count = len(requests)
-        metrics.total_response_time = sum(req.response_time for req in requests)
-        metrics.min_response_time = min(req.response_time for req in requests)
-        metrics.max_response_time = max(req.response_time for req in requests)
-        metrics.error_count = sum(1 for req in requests if req.status_code >= 400)
-        metrics.memory_usage = psutil.virtual_memory().percent / 100
-        metrics.cpu_usage = psutil.cpu_percent() / 100
+        metrics.request_count = len(response_times)
+        metrics.total_response_time = float(response_times.sum())
+        metrics.min_response_time = float(response_times.min())
+        metrics.max_response_time = float(response_times.max())
+        metrics.error_count = int((status_codes >= 400).sum())
+        metrics.active_requests = self.active_requests
+        self._sample_system()
+        metrics.memory_usage = self._mem_pct
+        metrics.cpu_usage = self._cpu_pct
         
         return metrics
     
-    def get_endpoint_metrics(self, endpoint: Optional[str] = None) -> Dict[str, PerformanceMetrics]:
+    def get_endpoint_metrics(self, endpoint: Optional[EndpointKey] = None) -> Dict[EndpointKey, PerformanceMetrics]:
         """获取端点性能指标"""
         if endpoint:
-            return {endpoint: self.endpoint_metrics.get(endpoint, PerformanceMetrics())}
+            metrics = self.endpoint_metrics.get(endpoint)
+            return {endpoint: metrics if metrics is not None else PerformanceMetrics()}
         return dict(self.endpoint_metrics)
     
     def get_slow_requests(self, threshold: float = 1.0, limit: int = 10) -> List[RequestMetrics]:
-        """获取慢请求列表"""
-        slow_requests = [
-            req for req in self.request_history 
-            if req.response_time > threshold
-        ]
-        slow_requests.sort(key=lambda x: x.response_time, reverse=True)
-        return slow_requests[:limit]
+        """获取慢请求列表（仅限保留窗口内的请求，从慢到快）"""
+        if limit <= 0:
+            return []
+        # 环形缓冲区与 request_history 按相同顺序写入，下标可直接对应
+        response_times = self._ordered(self._rt)
+        indices = np.flatnonzero(response_times > threshold)
+        if len(indices) > limit:
+            indices = indices[np.argpartition(response_times[indices], -limit)[-limit:]]
+        indices = indices[np.argsort(-response_times[indices], kind='stable')]
+        return [self.request_history[i] for i in indices]
     
     def get_error_requests(self, limit: int = 10) -> List[RequestMetrics]:
-        """获取错误请求列表"""
-        error_requests = [
-            req for req in self.request_history 
-            if req.status_code >= 400
-        ]
-        error_requests.sort(key=lambda x: x.timestamp, reverse=True)
-        return error_requests[:limit]
+        """获取错误请求列表（仅限保留窗口内的请求，从新到旧）"""
+        if limit <= 0:
+            return []
+        indices = np.flatnonzero(self._ordered(self._status) >= 400)[-limit:]
+        return [self.request_history[i] for i in reversed(indices)]
     
-    def get_alerts(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_alerts(self, limit: int = 10) -> List[Alert]:
         """获取最近的告警"""
-        return sorted(self.alerts, key=lambda x: x['timestamp'], reverse=True)[:limit]
+        return list(itertools.islice(reversed(self.alerts), limit))
     
     def clear_history(self) -> None:
         """清空历史数据"""
         self.metrics_history.clear()
         self.request_history.clear()
+        self._head = 0
+        self._count = 0
         self.endpoint_metrics.clear()
         self.alerts.clear()
 
@@ -221,31 +323,31 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """处理请求并记录性能指标"""
-        start_time = time.time()
-        memory_before = psutil.Process().memory_info().rss / 1024 / 1024  # MB
+        start_ns = time.perf_counter_ns()
+        method = request.method
+        path = request.scope["path"]
+        memory_before = self.monitor.process_memory_mb
         
         # 增加活跃请求计数
-        for metric in self.monitor.endpoint_metrics.values():
-            metric.active_requests += 1
+        self.monitor.active_requests += 1
         
         try:
             # 处理请求
             response = await call_next(request)
             
             # 计算性能指标
-            end_time = time.time()
-            response_time = end_time - start_time
-            memory_after = psutil.Process().memory_info().rss / 1024 / 1024  # MB
+            response_time = (time.perf_counter_ns() - start_ns) * 1e-9
+            memory_after = self.monitor.process_memory_mb
             
             # 创建请求指标
             request_metrics = RequestMetrics(
-                method=request.method,
-                path=str(request.url.path),
+                method=method,
+                path=path,
                 status_code=response.status_code,
                 response_time=response_time,
                 memory_before=memory_before,
                 memory_after=memory_after,
-                timestamp=datetime.now(),
+                ts_ns=time.time_ns(),
                 user_id=getattr(request.state, 'user_id', None),
                 request_id=getattr(request.state, 'request_id', None)
             )
@@ -261,18 +363,17 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             
         except Exception as e:
             # 记录错误请求
-            end_time = time.time()
-            response_time = end_time - start_time
-            memory_after = psutil.Process().memory_info().rss / 1024 / 1024  # MB
+            response_time = (time.perf_counter_ns() - start_ns) * 1e-9
+            memory_after = self.monitor.process_memory_mb
             
             request_metrics = RequestMetrics(
-                method=request.method,
-                path=str(request.url.path),
+                method=method,
+                path=path,
                 status_code=500,
                 response_time=response_time,
                 memory_before=memory_before,
                 memory_after=memory_after,
-                timestamp=datetime.now(),
+                ts_ns=time.time_ns(),
                 user_id=getattr(request.state, 'user_id', None),
                 request_id=getattr(request.state, 'request_id', None)
             )
@@ -282,50 +383,69 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             
         finally:
             # 减少活跃请求计数
-            for metric in self.monitor.endpoint_metrics.values():
-                metric.active_requests = max(0, metric.active_requests - 1)
+            self.monitor.active_requests -= 1
 
 class PerformanceProfiler:
     """性能分析器"""
     
     def __init__(self):
-        self.profiles: Dict[str, List[float]] = defaultdict(list)
+        # 操作名 -> 耗时数组（容量按倍数扩展），有效长度记录在 _counts 中
+        self.profiles: Dict[str, np.ndarray] = {}
+        self._counts: Dict[str, int] = {}
+        self._proc = psutil.Process()
+    
+    def record(self, operation_name: str, duration: float) -> None:
+        """记录一次操作耗时"""
+        durations = self.profiles.get(operation_name)
+        count = self._counts.get(operation_name, 0)
+        if durations is None:
+            durations = self.profiles[operation_name] = np.empty(64, dtype=np.float64)
+        elif count == len(durations):
+            grown = np.empty(count * 2, dtype=np.float64)
+            grown[:count] = durations
+            durations = self.profiles[operation_name] = grown
+        durations[count] = duration
+        self._counts[operation_name] = count + 1
     
     @asynccontextmanager
     async def profile(self, operation_name: str):
         """性能分析上下文管理器"""
         start_time = time.time()
-        start_memory = psutil.Process().memory_info().rss
+        start_memory = self._proc.memory_info().rss
         
         try:
             yield
         finally:
             end_time = time.time()
-            end_memory = psutil.Process().memory_info().rss
+            end_memory = self._proc.memory_info().rss
             
             duration = end_time - start_time
             memory_delta = (end_memory - start_memory) / 1024 / 1024  # MB
             
-            self.profiles[operation_name].append(duration)
+            self.record(operation_name, duration)
             
             logger.debug(
-                f"性能分析 - {operation_name}: "
-                f"耗时 {duration:.3f}s, 内存变化 {memory_delta:.1f}MB"
+                "性能分析 - %s: 耗时 %.3fs, 内存变化 %.1fMB",
+                operation_name, duration, memory_delta
             )
     
     def get_profile_stats(self, operation_name: str) -> Dict[str, float]:
         """获取操作的性能统计"""
-        durations = self.profiles.get(operation_name, [])
-        if not durations:
+        count = self._counts.get(operation_name, 0)
+        if not count:
             return {}
         
+        durations = self.profiles[operation_name][:count]
+        p95_index = int(count * 0.95)
+        total = float(durations.sum())
         return {
-            'count': len(durations),
-            'total': sum(durations),
-            'avg': sum(durations) / len(durations),
-            'min': min(durations),
-            'max': max(durations),
-            'p95': sorted(durations)[int(len(durations) * 0.95)] if durations else 0
+            'count': count,
+            'total': total,
+            'avg': total / count,
+            'min': float(durations.min()),
+            'max': float(durations.max()),
+            # partition 只做一次选择，不需要完整排序
+            'p95': float(np.partition(durations, p95_index)[p95_index])
         }
     
     def get_all_profiles(self) -> Dict[str, Dict[str, float]]:
@@ -342,24 +462,19 @@ def profile_operation(operation_name: str):
     """性能分析装饰器"""
     def decorator(func: Callable) -> Callable:
         if asyncio.iscoroutinefunction(func):
-            @functools.wraps(func)
+            @wraps(func)
             async def async_wrapper(*args, **kwargs):
                 async with performance_profiler.profile(operation_name):
                     return await func(*args, **kwargs)
             return async_wrapper
         else:
-            @functools.wraps(func)
+            @wraps(func)
             def sync_wrapper(*args, **kwargs):
-                start_time = time.time()
+                start_time = time.perf_counter()
                 try:
-                    result = func(*args, **kwargs)
-                    duration = time.time() - start_time
-                    performance_profiler.profiles[operation_name].append(duration)
-                    return result
-                except Exception:
-                    duration = time.time() - start_time
-                    performance_profiler.profiles[operation_name].append(duration)
-                    raise
+                    return func(*args, **kwargs)
+                finally:
+                    performance_profiler.record(operation_name, time.perf_counter() - start_time)
             return sync_wrapper
     return decorator
 
@@ -373,34 +488,40 @@ class PerformanceOptimizer:
         """分析性能瓶颈"""
         bottlenecks = []
         
-        # 分析慢端点
+        # 一次遍历同时分析慢端点与高错误率端点
         for endpoint, metrics in self.monitor.endpoint_metrics.items():
-            if metrics.avg_response_time > 1.0:  # 超过1秒
+            avg_response_time = metrics.avg_response_time
+            error_rate = metrics.error_rate
+            
+            if avg_response_time > 1.0:  # 超过1秒
                 bottlenecks.append({
                     'type': 'slow_endpoint',
-                    'endpoint': endpoint,
-                    'avg_response_time': metrics.avg_response_time,
+                    'endpoint': format_endpoint(endpoint),
+                    'avg_response_time': avg_response_time,
                     'request_count': metrics.request_count,
-                    'severity': 'high' if metrics.avg_response_time > 2.0 else 'medium'
+                    'severity': 'high' if avg_response_time > 2.0 else 'medium'
                 })
-        
-        # 分析高错误率端点
-        for endpoint, metrics in self.monitor.endpoint_metrics.items():
-            if metrics.error_rate > 0.05:  # 错误率超过5%
+            
+            if error_rate > 0.05:  # 错误率超过5%
                 bottlenecks.append({
                     'type': 'high_error_rate',
-                    'endpoint': endpoint,
-                    'error_rate': metrics.error_rate,
+                    'endpoint': format_endpoint(endpoint),
+                    'error_rate': error_rate,
                     'error_count': metrics.error_count,
-                    'severity': 'high' if metrics.error_rate > 0.1 else 'medium'
+                    'severity': 'high' if error_rate > 0.1 else 'medium'
                 })
         
         return sorted(bottlenecks, key=lambda x: x.get('severity', 'low'), reverse=True)
     
-    def suggest_optimizations(self) -> List[Dict[str, Any]]:
-        """建议性能优化方案"""
+    def suggest_optimizations(
+        self,
+        bottlenecks: Optional[List[Dict[str, Any]]] = None,
+        overall_metrics: Optional[PerformanceMetrics] = None
+    ) -> List[Dict[str, Any]]:
+        """建议性能优化方案（可传入已计算的瓶颈与整体指标，避免重复计算）"""
         suggestions = []
-        bottlenecks = self.analyze_bottlenecks()
+        if bottlenecks is None:
+            bottlenecks = self.analyze_bottlenecks()
         
         for bottleneck in bottlenecks:
             if bottleneck['type'] == 'slow_endpoint':
@@ -424,7 +545,8 @@ class PerformanceOptimizer:
                 })
         
         # 系统级建议
-        overall_metrics = self.monitor.get_overall_metrics()
+        if overall_metrics is None:
+            overall_metrics = self.monitor.get_overall_metrics()
         if overall_metrics.memory_usage > 0.8:
             suggestions.append({
                 'type': 'memory_optimization',
@@ -444,14 +566,13 @@ class PerformanceOptimizer:
 def get_performance_report() -> Dict[str, Any]:
     """获取性能报告"""
     overall_metrics = performance_monitor.get_overall_metrics()
-    endpoint_metrics = performance_monitor.get_endpoint_metrics()
     slow_requests = performance_monitor.get_slow_requests()
     error_requests = performance_monitor.get_error_requests()
     alerts = performance_monitor.get_alerts()
     
     optimizer = PerformanceOptimizer(performance_monitor)
     bottlenecks = optimizer.analyze_bottlenecks()
-    suggestions = optimizer.suggest_optimizations()
+    suggestions = optimizer.suggest_optimizations(bottlenecks, overall_metrics)
     
     return {
         'overall_metrics': {
@@ -462,14 +583,14 @@ def get_performance_report() -> Dict[str, Any]:
             'cpu_usage': overall_metrics.cpu_usage
         },
         'endpoint_metrics': {
-            endpoint: {
+            format_endpoint(endpoint): {
                 'request_count': metrics.request_count,
                 'avg_response_time': metrics.avg_response_time,
                 'error_rate': metrics.error_rate,
                 'min_response_time': metrics.min_response_time,
                 'max_response_time': metrics.max_response_time
             }
-            for endpoint, metrics in endpoint_metrics.items()
+            for endpoint, metrics in performance_monitor.endpoint_metrics.items()
         },
         'slow_requests': [
             {
@@ -489,7 +610,7 @@ def get_performance_report() -> Dict[str, Any]:
             }
             for req in error_requests
         ],
-        'alerts': alerts,
+        'alerts': [alert.to_dict() for alert in alerts],
         'bottlenecks': bottlenecks,
         'optimization_suggestions': suggestions,
         'profile_stats': performance_profiler.get_all_profiles()
@@ -1,13 +1,18 @@
 """
 权限管理器 - 统一处理权限检查逻辑
 """
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 from abc import ABC, abstractmethod
 
 from ..domain.models.user import User, UserRole
-from ..domain.models.knowledge_base import KnowledgeBase
+from ..domain.models.knowledge_base import KnowledgeBase, KnowledgeBaseType
 from ..core.errors import AuthorizationException, AuthenticationException
 
+# 各类操作对应的动作集合（模块加载时构建一次）
+_KB_READ_ACTIONS = frozenset({"read", "access", "query"})
+_KB_WRITE_ACTIONS = frozenset({"write", "modify", "update", "delete", "upload", "share"})
+_USER_SELF_ACTIONS = frozenset({"read", "update", "delete"})
+
 class PermissionChecker(ABC):
     """权限检查器基类"""
     
@@ -21,6 +26,36 @@ class PermissionChecker(ABC):
         if not self.check_permission(user, resource, action):
             raise AuthorizationException(f"无权执行操作: {action}")
 
+def _allow(user: User, kb: KnowledgeBase) -> bool:
+    return True
+
+def _deny(user: User, kb: KnowledgeBase) -> bool:
+    return False
+
+def _owner_only(user: User, kb: KnowledgeBase) -> bool:
+    return kb.owner_id == user.id
+
+def _kb_rule(kb_type: KnowledgeBaseType, action: str) -> Callable[[User, KnowledgeBase], bool]:
+    """普通用户对某类知识库执行某个操作时的判定规则"""
+    if action in _KB_READ_ACTIONS:
+        # 公开知识库所有人都可以访问，其余只有所有者可以访问
+        # TODO: 检查共享权限（KnowledgeBaseType.SHARED）
+        return _allow if kb_type == KnowledgeBaseType.PUBLIC else _owner_only
+    elif action in _KB_WRITE_ACTIONS:
+        # 只有知识库所有者可以修改
+        return _owner_only
+    elif action == "create":
+        return _allow  # 所有用户都可以创建知识库
+    else:
+        return _deny
+
+# (知识库类型, 操作) -> 判定规则，启动时按规则展开，检查时只需一次字典查找
+_KB_RULES: Dict[Tuple[str, str], Callable[[User, KnowledgeBase], bool]] = {
+    (kb_type.value, action): _kb_rule(kb_type, action)
+    for kb_type in KnowledgeBaseType
+    for action in _KB_READ_ACTIONS | _KB_WRITE_ACTIONS | {"create"}
+}
+
 class KnowledgeBasePermissionChecker(PermissionChecker):
     """知识库权限检查器"""
     
@@ -33,39 +68,7 @@ class KnowledgeBasePermissionChecker(PermissionChecker):
         if user.role == UserRole.ADMIN:
             return True
         
-        # 根据操作类型检查权限
-        if action in ["read", "access", "query"]:
-            return self._can_access_knowledge_base(kb, user)
-        elif action in ["write", "modify", "update", "delete", "upload", "share"]:
-            return self._can_modify_knowledge_base(kb, user)
-        elif action == "create":
-            return True  # 所有用户都可以创建知识库
-        else:
-            return False
-    
-    def _can_access_knowledge_base(self, kb: KnowledgeBase, user: User) -> bool:
-        """检查用户是否可以访问知识库"""
-        # 知识库所有者可以访问
-        if kb.owner_id == user.id:
-            return True
-        
-        # 公开知识库所有人都可以访问
-        if kb.kb_type.value == "public":
-            return True
-        
-        # TODO: 检查共享权限
-        # if kb.kb_type.value == "shared":
-        #     return self._is_shared_with_user(kb.id, user.id)
-        
-        return False
-    
-    def _can_modify_knowledge_base(self, kb: KnowledgeBase, user: User) -> bool:
-        """检查用户是否可以修改知识库"""
-        # 知识库所有者可以修改
-        if kb.owner_id == user.id:
-            return True
-        
-        return False
+        return _KB_RULES.get((kb.kb_type.value, action), _deny)(user, kb)
 
 class UserPermissionChecker(PermissionChecker):
     """用户权限检查器"""
@@ -80,7 +83,7 @@ class UserPermissionChecker(PermissionChecker):
             return True
         
         # 用户只能操作自己的资源
-        if action in ["read", "update", "delete"]:
+        if action in _USER_SELF_ACTIONS:
             return user.id == target_user.id
         elif action == "create":
             return True  # 所有人都可以创建用户（注册）
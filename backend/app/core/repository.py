@@ -1,16 +1,16 @@
 """
 改进的Repository基类 - 提供统一的数据访问接口和事务管理
 """
-import json
+import orjson
 import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, List, Optional, TypeVar, Generic, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Generic, Type, Union
 from enum import Enum
 from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy import select, insert, update, delete, func, and_, or_, bindparam, inspect
 from sqlalchemy.orm import selectinload, joinedload
 
 from .database import db_manager
@@ -21,6 +21,9 @@ logger = get_logger(__name__)
 
 T = TypeVar('T')
 
+# 更新时不视为实际变更的字段
+_TIMESTAMP_FIELDS = frozenset({'created_at', 'updated_at'})
+
 class BaseRepository(Generic[T], ABC):
     """Repository基类"""
     
@@ -29,15 +32,22 @@ class BaseRepository(Generic[T], ABC):
         self._session = session
         self._external_session = session is not None
         self.logger = get_logger(self.__class__.__name__)
+        # 模型列属性名与JSON字段，构造时计算一次，查询时用集合判断代替逐个 hasattr 探测
+        self._columns = frozenset(attr.key for attr in inspect(model_class).column_attrs)
+        self._json_fields = frozenset(self._get_json_fields())
     
-    @property
-    async def session(self) -> AsyncSession:
-        """获取数据库会话"""
-        if self._session:
-            return self._session
-        # 如果没有外部会话，创建新的会话
-        async for session in db_manager.get_session():
-            return session
+    @asynccontextmanager
+    async def _read_session(self):
+        """获取用于单次读操作的数据库会话
+        
+        有外部会话时直接使用（可以读到调用者未提交的修改）；否则从只读连接池取会话，
+        操作结束后关闭。SQLite下只读连接池与写连接分开，读操作不占用写连接
+        """
+        if self._external_session:
+            yield self._session
+        else:
+            async with db_manager.get_read_session() as session:
+                yield session
     
     @asynccontextmanager
     async def transaction(self):
@@ -64,7 +74,7 @@ class BaseRepository(Generic[T], ABC):
         prepared = {}
         for key, value in data.items():
             if isinstance(value, (dict, list)):
-                prepared[key] = json.dumps(value, ensure_ascii=False)
+                prepared[key] = orjson.dumps(value).decode()
             elif isinstance(value, Enum):
                 prepared[key] = value.value
             elif value is not None:
@@ -73,12 +83,13 @@ class BaseRepository(Generic[T], ABC):
     
     def _convert_to_entity(self, data: Dict[str, Any]) -> T:
         """将字典数据转换为实体对象"""
-        # 处理JSON字段
-        for key, value in data.items():
-            if isinstance(value, str) and key in self._get_json_fields():
+        # 处理JSON字段：只检查声明的JSON字段，而不是逐列扫描
+        for key in self._json_fields:
+            value = data.get(key)
+            if isinstance(value, str):
                 try:
-                    data[key] = json.loads(value)
-                except (json.JSONDecodeError, TypeError):
+                    data[key] = orjson.loads(value)
+                except orjson.JSONDecodeError:
                     pass
         
         return self.model_class.from_dict(data)
@@ -88,6 +99,17 @@ class BaseRepository(Generic[T], ABC):
         # 子类可以重写此方法来指定JSON字段
         return []
     
+    def _apply_filters(self, stmt, filters: Dict[str, Any]):
+        """应用过滤条件：列表值使用IN，其余为等值比较，非模型列的键被忽略"""
+        for key, value in filters.items():
+            if key in self._columns:
+                column = getattr(self.model_class, key)
+                if isinstance(value, list):
+                    stmt = stmt.where(column.in_(value))
+                else:
+                    stmt = stmt.where(column == value)
+        return stmt
+    
     # === 基础CRUD操作 ===
     
     async def create(self, data: Union[Dict[str, Any], T]) -> T:
@@ -124,10 +146,9 @@ class BaseRepository(Generic[T], ABC):
     
     async def get_by_id(self, entity_id: str) -> Optional[T]:
         """通过ID获取实体"""
-        session = await self.session
-        stmt = select(self.model_class).where(self.model_class.id == entity_id)
-        result = await session.execute(stmt)
-        return result.scalar_one_or_none()
+        async with self._read_session() as session:
+            # 优先命中会话的identity map，未命中时才按主键查询
+            return await session.get(self.model_class, entity_id)
     
     async def update(self, entity: Union[T, str], data: Optional[Dict[str, Any]] = None) -> Optional[T]:
         """更新实体"""
@@ -142,19 +163,23 @@ class BaseRepository(Generic[T], ABC):
                 for key, value in data.items():
                     if hasattr(entity, key):
                         setattr(entity, key, value)
-            entity.updated_at = datetime.now()
         
+        # updated_at 由列的 onupdate 生成；只有时间戳字段时没有实际变更，跳过UPDATE
         if data:
-            data['updated_at'] = datetime.now()
-            prepared_data = self._prepare_data(data)
-            
-            async with self.transaction() as session:
-                stmt = update(self.model_class).where(
-                    self.model_class.id == entity_id
-                ).values(**prepared_data)
-                await session.execute(stmt)
+            data.pop('id', None)
+        if not data or data.keys() <= _TIMESTAMP_FIELDS:
+            return await self.get_by_id(entity_id)
         
-        return await self.get_by_id(entity_id)
+        prepared_data = self._prepare_data(data)
+        async with self.transaction() as session:
+            stmt = update(self.model_class).where(
+                self.model_class.id == entity_id
+            ).values(**prepared_data)
+            await session.execute(stmt)
+        
+        # 重新加载以覆盖会话中已过期的 updated_at
+        async with self._read_session() as session:
+            return await session.get(self.model_class, entity_id, populate_existing=True)
     
     async def delete(self, entity_id: str) -> bool:
         """删除实体"""
@@ -165,7 +190,6 @@ class BaseRepository(Generic[T], ABC):
     
     async def get_all(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[T]:
         """获取所有实体"""
-        session = await self.session
         stmt = select(self.model_class)
         
         if offset:
@@ -173,38 +197,25 @@ class BaseRepository(Generic[T], ABC):
         if limit:
             stmt = stmt.limit(limit)
         
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+        async with self._read_session() as session:
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
     
     async def count(self, **filters) -> int:
         """统计实体数量"""
-        session = await self.session
-        stmt = select(func.count(self.model_class.id))
-        
-        # 应用过滤条件
-        for key, value in filters.items():
-            if hasattr(self.model_class, key):
-                stmt = stmt.where(getattr(self.model_class, key) == value)
-        
-        result = await session.execute(stmt)
-        return result.scalar()
+        stmt = self._apply_filters(select(func.count(self.model_class.id)), filters)
+        async with self._read_session() as session:
+            result = await session.execute(stmt)
+            return result.scalar()
     
     # === 查询操作 ===
     
     async def find_by(self, **filters) -> List[T]:
         """根据条件查找实体"""
-        session = await self.session
-        stmt = select(self.model_class)
-        
-        for key, value in filters.items():
-            if hasattr(self.model_class, key):
-                if isinstance(value, list):
-                    stmt = stmt.where(getattr(self.model_class, key).in_(value))
-                else:
-                    stmt = stmt.where(getattr(self.model_class, key) == value)
-        
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+        stmt = self._apply_filters(select(self.model_class), filters)
+        async with self._read_session() as session:
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
     
     async def find_one_by(self, **filters) -> Optional[T]:
         """根据条件查找单个实体"""
@@ -219,53 +230,100 @@ class BaseRepository(Generic[T], ABC):
     # === 批量操作 ===
     
     async def bulk_create(self, entities: List[Union[Dict[str, Any], T]]) -> List[T]:
-        """批量创建实体"""
-        created_entities = []
+        """批量创建实体 - 字典数据通过单条INSERT批量执行，并用RETURNING取回实体"""
+        if not entities:
+            return []
+        
+        now = datetime.now()
+        rows: List[Dict[str, Any]] = []
+        row_positions: List[int] = []
+        instances: List[T] = []
+        instance_positions: List[int] = []
+        for position, entity_data in enumerate(entities):
+            if isinstance(entity_data, dict):
+                if not entity_data.get('id'):
+                    entity_data['id'] = str(uuid.uuid4())
+                entity_data.setdefault('created_at', now)
+                rows.append(self._prepare_data(entity_data))
+                row_positions.append(position)
+            else:
+                if not entity_data.id:
+                    entity_data.id = str(uuid.uuid4())
+                if not entity_data.created_at:
+                    entity_data.created_at = now
+                instances.append(entity_data)
+                instance_positions.append(position)
         
+        created_entities: List[Optional[T]] = [None] * len(entities)
         async with self.transaction() as session:
-            for entity_data in entities:
-                if isinstance(entity_data, dict):
-                    if 'id' not in entity_data or not entity_data['id']:
-                        entity_data['id'] = str(uuid.uuid4())
-                    if 'created_at' not in entity_data:
-                        entity_data['created_at'] = datetime.now()
-                    
-                    prepared_data = self._prepare_data(entity_data)
-                    entity = self.model_class(**prepared_data)
-                else:
-                    entity = entity_data
-                    if not entity.id:
-                        entity.id = str(uuid.uuid4())
-                    if not entity.created_at:
-                        entity.created_at = datetime.now()
-                
-                session.add(entity)
-                created_entities.append(entity)
+            if rows:
+                for position, entity in zip(row_positions, await self._insert_rows(session, rows)):
+                    created_entities[position] = entity
             
-            await session.flush()
-            for entity in created_entities:
-                await session.refresh(entity)
+            if instances:
+                session.add_all(instances)
+                await session.flush()
+                for position, entity in zip(instance_positions, instances):
+                    await session.refresh(entity)
+                    created_entities[position] = entity
         
         return created_entities
     
+    async def _insert_rows(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> List[T]:
+        """批量插入行并按传入顺序返回实体"""
+        # _prepare_data 会丢弃None值，各行的列可能不同；相同列的行连续排列时才能合并为一条INSERT
+        order = sorted(range(len(rows)), key=lambda i: sorted(rows[i]))
+        ordered_rows = [rows[i] for i in order]
+        
+        if session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            stmt = insert(self.model_class).returning(self.model_class, sort_by_parameter_order=True)
+            result = await session.execute(stmt, ordered_rows)
+            entities: List[Optional[T]] = [None] * len(rows)
+            for i, entity in zip(order, result.scalars()):
+                entities[i] = entity
+            return entities
+        
+        # 不支持批量RETURNING的方言：插入后一次查询取回，而不是逐条refresh
+        await session.execute(insert(self.model_class), ordered_rows)
+        ids = [row['id'] for row in rows]
+        result = await session.execute(select(self.model_class).where(self.model_class.id.in_(ids)))
+        by_id = {entity.id: entity for entity in result.scalars()}
+        return [by_id[entity_id] for entity_id in ids]
+    
     async def bulk_update(self, updates: List[Dict[str, Any]]) -> int:
-        """批量更新实体"""
+        """批量更新实体 - 相同列的更新合并为一条 UPDATE ... WHERE id = :_id 批量执行"""
         if not updates:
             return 0
         
+        # _prepare_data 会丢弃None值，按更新的列分组，每组一次executemany
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for update_data in updates:
+            entity_id = update_data.pop('id')
+            row = self._prepare_data(update_data)
+            if not row:
+                continue
+            row['_id'] = entity_id
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        
+        table = self.model_class.__table__
+        stmt = update(table).where(table.c.id == bindparam('_id'))
         updated_count = 0
         async with self.transaction() as session:
-            for update_data in updates:
-                entity_id = update_data.pop('id')
-                update_data['updated_at'] = datetime.now()
-                prepared_data = self._prepare_data(update_data)
-                
-                stmt = update(self.model_class).where(
-                    self.model_class.id == entity_id
-                ).values(**prepared_data)
-                
-                result = await session.execute(stmt)
+            for rows in groups.values():
+                result = await session.execute(stmt, rows)
                 updated_count += result.rowcount
+            
+            # Core UPDATE不会同步会话中已加载的实体，一次查询覆盖其过期属性
+            stale_ids = [
+                row['_id'] for rows in groups.values() for row in rows
+                if session.identity_key(self.model_class, row['_id']) in session.identity_map
+            ]
+            if stale_ids:
+                await session.execute(
+                    select(self.model_class)
+                    .where(self.model_class.id.in_(stale_ids))
+                    .execution_options(populate_existing=True)
+                )
         
         return updated_count
     
@@ -292,23 +350,23 @@ class BaseRepository(Generic[T], ABC):
         """分页查询"""
         offset = (page - 1) * size
         
-        # 获取总数
-        total = await self.count(**filters)
-        
-        # 获取数据
-        session = await self.session
-        stmt = select(self.model_class).offset(offset).limit(size)
+        # 总数通过窗口函数随数据一起返回，只需一次查询
+        stmt = self._apply_filters(
+            select(self.model_class, func.count().over().label('_total')), filters
+        ).offset(offset).limit(size)
         
-        # 应用过滤条件
-        for key, value in filters.items():
-            if hasattr(self.model_class, key):
-                if isinstance(value, list):
-                    stmt = stmt.where(getattr(self.model_class, key).in_(value))
-                else:
-                    stmt = stmt.where(getattr(self.model_class, key) == value)
+        async with self._read_session() as session:
+            result = await session.execute(stmt)
+            rows = result.all()
+        items = [row[0] for row in rows]
         
-        result = await session.execute(stmt)
-        items = list(result.scalars().all())
+        if rows:
+            total = rows[0]._total
+        elif offset:
+            # 页码超出范围时没有返回行，需要单独统计总数
+            total = await self.count(**filters)
+        else:
+            total = 0
         
         return {
             'items': items,
@@ -322,7 +380,6 @@ class BaseRepository(Generic[T], ABC):
     
     async def find_with_relations(self, entity_id: str, *relations) -> Optional[T]:
         """查找实体并加载关联数据"""
-        session = await self.session
         stmt = select(self.model_class).where(self.model_class.id == entity_id)
         
         # 添加关联加载
@@ -330,8 +387,9 @@ class BaseRepository(Generic[T], ABC):
             if hasattr(self.model_class, relation):
                 stmt = stmt.options(selectinload(getattr(self.model_class, relation)))
         
-        result = await session.execute(stmt)
-        return result.scalar_one_or_none()
+        async with self._read_session() as session:
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
     
     async def search(
         self, 
@@ -340,13 +398,12 @@ class BaseRepository(Generic[T], ABC):
         limit: Optional[int] = None
     ) -> List[T]:
         """文本搜索"""
-        session = await self.session
         stmt = select(self.model_class)
         
         # 构建搜索条件
         search_conditions = []
         for field in fields:
-            if hasattr(self.model_class, field):
+            if field in self._columns:
                 search_conditions.append(
                     getattr(self.model_class, field).ilike(f'%{query}%')
                 )
@@ -357,8 +414,9 @@ class BaseRepository(Generic[T], ABC):
         if limit:
             stmt = stmt.limit(limit)
         
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+        async with self._read_session() as session:
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
     
     # === 事务操作 ===
     
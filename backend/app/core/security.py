@@ -97,9 +97,12 @@ async def verify_api_key(api_key: Optional[str] = Depends(api_key_header)) -> Di
 """
 安全相关功能，包括密码哈希和JWT令牌
 """
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Optional, Tuple, Union
 
+import xxhash
 from jose import jwt
 from passlib.context import CryptContext
 from pydantic import ValidationError
@@ -170,13 +173,40 @@ def decode_token(token: str) -> Optional[TokenData]:
             user_id=user_id,
             username=username,
             role=role,
-            exp=datetime.fromtimestamp(exp)
+            exp=datetime.fromtimestamp(exp) if exp is not None else None
         )
         
         return token_data
     except (jwt.JWTError, ValidationError):
         return None
 
+# 已验证令牌缓存：令牌哈希 -> (过期时间戳, 令牌数据)，按令牌自身的过期时间失效
+_TOKEN_CACHE_SIZE = 8192
+_token_cache: "OrderedDict[int, Tuple[float, TokenData]]" = OrderedDict()
+
+def decode_token_cached(token: str) -> Optional[TokenData]:
+    """解码并验证令牌，结果按令牌哈希缓存，避免每个请求重复验签"""
+    key = xxhash.xxh3_128_intdigest(token.encode())
+    item = _token_cache.get(key)
+    if item is not None:
+        expires_at, token_data = item
+        if expires_at > time.time():
+            _token_cache.move_to_end(key)
+            return token_data
+        del _token_cache[key]
+
+    token_data = decode_token(token)
+    if token_data is None:
+        return None
+
+    # 签名已在decode_token中验证，这里只读取过期时间；没有过期时间的令牌不缓存
+    expires_at = jwt.get_unverified_claims(token).get("exp")
+    if expires_at is not None:
+        _token_cache[key] = (expires_at, token_data)
+        if len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return token_data
+
 # 验证令牌并返回原始载荷
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
     """验证令牌并返回payload
@@ -7,7 +7,7 @@ from enum import Enum
 from pydantic import BaseModel, Field
 import json
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean, JSON, func
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean, JSON, Index, func
 from sqlalchemy.orm import relationship
 
 from ...core.database import BaseModel as SQLAlchemyBaseModel, Base
@@ -109,8 +109,10 @@ class Conversation(BaseModel):
 class ConversationModel(SQLAlchemyBaseModel):
     """会话数据库模型"""
     __tablename__ = "conversations"
+    # 用户会话列表按更新时间排序，复合索引同时覆盖按user_id过滤
+    __table_args__ = (Index("idx_conversations_user", "user_id", "updated_at"),)
     
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     is_pinned = Column(Boolean, default=False)
     model_id = Column(String(100))
@@ -171,8 +173,10 @@ class ConversationModel(SQLAlchemyBaseModel):
 class MessageModel(SQLAlchemyBaseModel):
     """消息数据库模型"""
     __tablename__ = "messages"
+    # 按会话取消息并按时间排序
+    __table_args__ = (Index("idx_messages_conversation", "conversation_id", "created_at"),)
     
-    conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=False, index=True)
+    conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=False)
     role = Column(String(20), nullable=False)
     content = Column(Text, nullable=False)
     msg_metadata = Column(JSON, default=dict)
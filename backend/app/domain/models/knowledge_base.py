@@ -41,7 +41,7 @@ class KnowledgeBase(BaseModel):
     
     name = Column(String(255), nullable=False)
     description = Column(Text)
-    owner_id = Column(String, ForeignKey("users.id"))
+    owner_id = Column(String, ForeignKey("users.id"), index=True)
     embedding_model = Column(String(100), default="default")
     status = Column(String(50), default=KnowledgeBaseStatus.ACTIVE.value)
     kb_type = Column(String(50), default=KnowledgeBaseType.PERSONAL.value)
@@ -121,7 +121,7 @@ class KnowledgeFile(BaseModel):
     """知识库文件模型 - SQLAlchemy版本"""
     __tablename__ = "knowledge_files"
     
-    knowledge_base_id = Column(String, ForeignKey("knowledge_bases.id"), nullable=False)
+    knowledge_base_id = Column(String, ForeignKey("knowledge_bases.id"), nullable=False, index=True)
     file_name = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
     file_type = Column(String(150))  # 增加长度以支持长MIME类型
@@ -171,7 +171,7 @@ class KnowledgeShare(BaseModel):
     __tablename__ = "knowledge_shares"
     
     knowledge_base_id = Column(String, ForeignKey("knowledge_bases.id"), nullable=False)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     
     # 关系 - 临时注释避免循环依赖
     # knowledge_base = relationship("KnowledgeBase", back_populates="shares")
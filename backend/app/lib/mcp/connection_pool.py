@@ -69,20 +69,24 @@ class MCPConnectionPool:
             创建的Hub实例
         """
         async with self._instance_lock:
-            # 如果已存在，先关闭旧的
-            if user_id in self._user_hubs:
-                await self._close_hub(user_id)
-            
-            # 创建新Hub
-            config_dict = self._build_hub_config(servers, user_id)
-            hub = MCPHub(config_dict=config_dict)
-            
-            # 存储并返回
-            self._user_hubs[user_id] = hub
-            self._last_access[user_id] = datetime.now()
-            
-            logger.info(f"为用户 {user_id} 创建新Hub，包含 {len(servers)} 个服务器")
-            return hub
+            return await self._create_user_hub_locked(user_id, servers)
+
+    async def _create_user_hub_locked(self, user_id: str, servers: List[MCPServer]) -> MCPHub:
+        """创建用户Hub，调用方需持有 _instance_lock"""
+        # 如果已存在，先关闭旧的
+        if user_id in self._user_hubs:
+            await self._close_hub(user_id)
+        
+        # 创建新Hub
+        config_dict = self._build_hub_config(servers, user_id)
+        hub = MCPHub(config_dict=config_dict)
+        
+        # 存储并返回
+        self._user_hubs[user_id] = hub
+        self._last_access[user_id] = datetime.now()
+        
+        logger.info(f"为用户 {user_id} 创建新Hub，包含 {len(servers)} 个服务器")
+        return hub
 
     async def get_or_create_user_hub(self, user_id: str, servers: List[MCPServer]) -> MCPHub:
         """
@@ -100,8 +104,12 @@ class MCPConnectionPool:
         if hub:
             return hub
         
-        # 不存在则创建
-        return await self.create_user_hub(user_id, servers)
+        # 不存在则在锁内再检查一次后创建，避免并发请求各自创建Hub、后者关闭前者
+        async with self._instance_lock:
+            hub = self._user_hubs.get(user_id)
+            if hub:
+                return hub
+            return await self._create_user_hub_locked(user_id, servers)
 
     async def update_user_hub_servers(self, user_id: str, servers: List[MCPServer]) -> MCPHub:
         """
@@ -7,9 +7,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .api import api_router
 from .core.errors import register_exception_handlers
-from .core.config import get_settings
+from .core.config import get_settings, prewarm
 from .core.constants import ServerConstants
-from .core.logging import setup_logging, get_logger
+from .core.database import db_manager
+from .core.cache import close_cache_backend
+from .core.logging import setup_logging, shutdown_logging, get_logger
 from .api.middleware import RequestLoggingMiddleware, SecurityHeadersMiddleware
 
 @asynccontextmanager
@@ -20,6 +22,10 @@ async def lifespan(app: FastAPI):
     logger = get_logger("main")
     logger.info("应用启动中...")
     
+    # 后台预热模型，避免首个请求阻塞在冷导入上
+    if settings.PREWARM_MODELS:
+        prewarm()
+    
     # 应用启动完成
     logger.info("应用启动完成")
     
@@ -27,6 +33,9 @@ async def lifespan(app: FastAPI):
     
     # 关闭时的清理工作
     logger.info("应用关闭中...")
+    await db_manager.close()
+    await close_cache_backend()
+    shutdown_logging()
 
 # 创建FastAPI应用
 settings = get_settings()
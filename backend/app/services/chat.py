@@ -271,7 +271,7 @@ class ChatService:
         self.knowledge_results = None
         self.search_results = None
         
-        logger.info(f"聊天服务已创建，使用提供商: {self.settings.LLM_PROVIDER}")
+        logger.info(f"聊天服务已创建，使用提供商: {self.settings.LLM_PROVIDER.value}")
 
     async def chat_stream(self, request: ChatRequest, stop_key: Optional[str] = None) -> AsyncGenerator[StreamEvent, None]:
         """
@@ -942,15 +942,15 @@ class ChatService:
             from ..core.config import get_settings
             settings = get_settings()
             if config.provider == "openai" and settings.OPENAI_API_KEY:
-                params["api_key"] = settings.OPENAI_API_KEY
+                params["api_key"] = settings.get_secret("OPENAI_API_KEY")
             elif config.provider == "deepseek" and settings.DEEPSEEK_API_KEY:
-                params["api_key"] = settings.DEEPSEEK_API_KEY
+                params["api_key"] = settings.get_secret("DEEPSEEK_API_KEY")
             elif config.provider == "azure" and settings.AZURE_API_KEY:
-                params["api_key"] = settings.AZURE_API_KEY
+                params["api_key"] = settings.get_secret("AZURE_API_KEY")
             elif config.provider == "gemini" and settings.GEMINI_API_KEY:
-                params["api_key"] = settings.GEMINI_API_KEY
+                params["api_key"] = settings.get_secret("GEMINI_API_KEY")
             elif config.provider == "anthropic" and settings.ANTHROPIC_API_KEY:
-                params["api_key"] = settings.ANTHROPIC_API_KEY
+                params["api_key"] = settings.get_secret("ANTHROPIC_API_KEY")
             else:
                 # 如果没有系统配置的API密钥，使用默认值避免初始化失败
                 params["api_key"] = "default-key"
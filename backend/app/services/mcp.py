@@ -26,7 +26,7 @@ from ..domain.models.mcp import (
 from ..domain.schemas.tools import Tool, ToolParameter
 from ..repositories.mcp import MCPRepository
 from ..lib.mcp import MCPHub, ConfigProvider
-from ..core.database import get_session
+from ..core.database import db_manager
 
 logger = get_logger(__name__)
 
@@ -790,13 +790,12 @@ class MCPService(BaseService[MCPServer, MCPRepository]):
     async def _auto_connect_server(self, server_id: str, user_id: str) -> None:
         """自动连接服务器（后台任务）"""
         try:
-            # 🔥 修复：使用异步迭代器正确处理异步生成器
-            async for independent_session in get_session():
+            # 后台任务不能复用请求会话，直接获取独立会话；async with 保证退出时立即关闭
+            async with db_manager.get_session() as independent_session:
                 independent_repository = MCPRepository(independent_session)
                 server = await independent_repository.get_by_id(server_id)
                 if server and server.active and server.auto_start:
                     await self._test_single_server_connection(server, user_id)
-                break  # 只获取一次会话
         except Exception as e:
             logger.error(f"自动连接服务器 {server_id} 失败: {str(e)}")
     
@@ -95,7 +95,7 @@ class SearchService:
     """搜索服务类"""
     
     def __init__(self):
-        self.google_api_key = settings.GOOGLE_API_KEY
+        self.google_api_key = settings.get_secret("GOOGLE_API_KEY")
         self.google_cse_id = settings.GOOGLE_CSE_ID
         logger.info("搜索服务初始化")
     
@@ -17,7 +17,7 @@ from ..domain.models.user_llm_config import (
     UserLLMConfigResponse, LLMProvider, UserLLMConfig
 )
 from ..repositories.user_llm_config import UserLLMConfigRepository
-from ..core.config import get_settings
+from ..core.config import get_settings, Provider
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -217,7 +217,7 @@ class UserLLMConfigService(BaseService[UserLLMConfigModel, UserLLMConfigReposito
             context_length=32768,
             system_prompt="你是一个有用的AI助手。",
             config_name="默认配置",
-            api_key=settings.DEEPSEEK_API_KEY,
+            api_key=settings.get_secret("DEEPSEEK_API_KEY"),
             base_url=settings.DEEPSEEK_BASE_URL,
             is_default=True
         )
@@ -229,7 +229,7 @@ class UserLLMConfigService(BaseService[UserLLMConfigModel, UserLLMConfigReposito
         # 尝试使用系统配置的API密钥    
         #     
         # 根据系统默认Provider选择配置
-        if settings.LLM_PROVIDER == "ollama":
+        if settings.LLM_PROVIDER is Provider.OLLAMA:
             return UserLLMConfig(
                 id="default_config",
                 user_id="unknown",
@@ -245,13 +245,13 @@ class UserLLMConfigService(BaseService[UserLLMConfigModel, UserLLMConfigReposito
                 created_at=datetime.now().isoformat(),
                 updated_at=datetime.now().isoformat()
             )
-        elif settings.LLM_PROVIDER == "deepseek":
+        elif settings.LLM_PROVIDER is Provider.DEEPSEEK:
             return UserLLMConfig(
                 id="default_config",
                 user_id="unknown",
                 provider=LLMProvider.DEEPSEEK,
                 model_name=settings.LLM_MODEL_NAME,
-                api_key=settings.DEEPSEEK_API_KEY,
+                api_key=settings.get_secret("DEEPSEEK_API_KEY"),
                 base_url=settings.DEEPSEEK_BASE_URL,
                 temperature=0.7,
                 max_tokens=4096,
@@ -269,7 +269,7 @@ class UserLLMConfigService(BaseService[UserLLMConfigModel, UserLLMConfigReposito
                 user_id="unknown",
                 provider=LLMProvider.OPENAI,
                 model_name="gpt-3.5-turbo",
-                api_key=settings.OPENAI_API_KEY,
+                api_key=settings.get_secret("OPENAI_API_KEY"),
                 base_url=settings.OPENAI_BASE_URL,
                 temperature=0.7,
                 max_tokens=4096,
@@ -0,0 +1,91 @@
+"""
+缓存后端单元测试
+
+专注于测试：
+- Redis缓存后端的JSON序列化与键前缀
+- Redis令牌桶脚本
+使用 fakeredis 模拟Redis（未安装时跳过）
+"""
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+from app.core import cache
+from app.core.cache import RedisBackend
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class Item(BaseModel):
+    name: str
+    tags: list
+
+
+@pytest.mark.unit
+class TestRedisBackend:
+    """RedisBackend 测试"""
+
+    @pytest_asyncio.fixture
+    async def client(self, monkeypatch):
+        client = fakeredis.FakeAsyncRedis()
+        monkeypatch.setattr(cache, "aioredis", SimpleNamespace(from_url=lambda url: client))
+        yield client
+        await client.aclose()
+
+    @pytest.fixture
+    def backend(self, client):
+        return RedisBackend("redis://test")
+
+    @pytest.mark.asyncio
+    async def test_values_are_stored_as_json(self, backend, client):
+        """缓存值以JSON保存，Pydantic模型读回为字典"""
+        await backend.set("key", {"item": Item(name="a", tags=[1, 2])}, ttl=60)
+
+        assert await client.get("cache:key") == b'{"item":{"name":"a","tags":[1,2]}}'
+        assert await backend.get("key") == {"item": {"name": "a", "tags": [1, 2]}}
+
+    @pytest.mark.asyncio
+    async def test_pickle_payload_is_ignored(self, backend, client):
+        """Redis中的非JSON数据（如pickle）不会被反序列化，视为未命中"""
+        await client.set("cache:key", b"\x80\x04K\x01.")
+
+        assert await backend.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_non_json_value_is_not_cached(self, backend, client):
+        """无法表示为JSON的值不写入Redis"""
+        await backend.set("key", object(), ttl=60)
+
+        assert await client.get("cache:key") is None
+
+    @pytest.mark.asyncio
+    async def test_ttl_is_applied(self, backend, client):
+        """写入时设置过期时间"""
+        await backend.set("key", 1, ttl=60)
+
+        assert 0 < await client.ttl("cache:key") <= 60
+
+    @pytest.mark.asyncio
+    async def test_clear_only_removes_own_prefix(self, backend, client):
+        """清空缓存时不删除其他前缀的键"""
+        await backend.set("key", 1, ttl=60)
+        await client.set("other:key", b"1")
+
+        await backend.clear()
+
+        assert await client.get("cache:key") is None
+        assert await client.get("other:key") == b"1"
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_script(self, backend):
+        """令牌桶脚本：容量内放行，耗尽后返回需要等待的秒数"""
+        pytest.importorskip("lupa")
+
+        assert await backend.take_token("k", capacity=2, refill_rate=1.0) == 0
+        assert await backend.take_token("k", capacity=2, refill_rate=1.0) == 0
+        wait = await backend.take_token("k", capacity=2, refill_rate=1.0)
+
+        assert 0 < wait <= 1.0
+        assert await backend.take_token("other", capacity=2, refill_rate=1.0) == 0
@@ -0,0 +1,143 @@
+"""
+配置模块单元测试
+
+专注于测试：
+- 惰性单例（模块级 __getattr__）
+- LLM提供商解析与回退
+- 密钥字段（SecretStr）
+"""
+import threading
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from app.core import config
+from app.core.config import Provider, Settings
+
+
+@pytest.mark.unit
+class TestLazySingletons:
+    """模块级惰性单例测试"""
+
+    @pytest.fixture
+    def builders(self, monkeypatch):
+        """用计数的构建函数替换 llm / provider，测试结束后清除已发布的单例"""
+        calls = {"llm": 0, "provider": 0}
+
+        def make(name):
+            def build():
+                calls[name] += 1
+                return object()
+            return build
+
+        for name in calls:
+            monkeypatch.setitem(config._LAZY_BUILDERS, name, make(name))
+            monkeypatch.delitem(vars(config), name, raising=False)
+        yield calls
+        for name in calls:
+            vars(config).pop(name, None)
+
+    def test_built_once_and_published(self, builders):
+        """首次访问时构建并写入模块全局变量，之后直接复用"""
+        llm = config.get_llm_model()
+
+        assert config.get_llm_model() is llm
+        assert config.llm is llm
+        assert builders["llm"] == 1
+
+    def test_unknown_attribute(self):
+        """未注册的属性仍抛出 AttributeError"""
+        with pytest.raises(AttributeError):
+            config.no_such_attribute
+
+    def test_slow_build_does_not_block_other_singletons(self, builders, monkeypatch):
+        """一个单例构建较慢时，其他单例的访问不被阻塞"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_llm():
+            started.set()
+            release.wait(5)
+            return "llm"
+
+        monkeypatch.setitem(config._LAZY_BUILDERS, "llm", slow_llm)
+        thread = threading.Thread(target=config.get_llm_model)
+        thread.start()
+        try:
+            assert started.wait(5)
+            begin = time.monotonic()
+            config.get_provider()
+            assert time.monotonic() - begin < 1
+        finally:
+            release.set()
+            thread.join()
+        assert config.get_llm_model() == "llm"
+
+    def test_concurrent_builds_publish_one_instance(self, builders):
+        """并发构建时所有调用者拿到同一个实例"""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(config.get_provider())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(result) for result in results}) == 1
+
+
+@pytest.mark.unit
+class TestLlmProvider:
+    """LLM_PROVIDER 解析测试"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("openai", Provider.OPENAI),
+        (" DeepSeek ", Provider.DEEPSEEK),
+        (Provider.GEMINI, Provider.GEMINI),
+    ])
+    def test_parsed_case_insensitive(self, value, expected):
+        """提供商在加载配置时解析为枚举，大小写与空白不敏感"""
+        assert Settings(_env_file=None, LLM_PROVIDER=value).LLM_PROVIDER is expected
+
+    def test_unknown_provider_falls_back_to_ollama(self, caplog):
+        """未知提供商回退到Ollama并记录警告，而不是启动失败"""
+        settings = Settings(_env_file=None, LLM_PROVIDER="bogus")
+
+        assert settings.LLM_PROVIDER is Provider.OLLAMA
+        assert "bogus" in caplog.text
+
+    def test_every_provider_has_llm_factory(self):
+        """每个提供商都有对应的LLM工厂"""
+        assert all(("llm", provider.value) in config._FACTORIES for provider in Provider)
+
+
+@pytest.mark.unit
+class TestSecrets:
+    """密钥字段测试"""
+
+    def test_secret_hidden_in_repr(self):
+        """密钥不会出现在配置的字符串表示中"""
+        settings = Settings(_env_file=None, OPENAI_API_KEY="sk-plaintext")
+
+        assert "sk-plaintext" not in repr(settings)
+        assert "sk-plaintext" not in str(settings.model_dump())
+
+    def test_get_secret(self):
+        """get_secret 返回明文，未配置时为None"""
+        settings = Settings(_env_file=None, DEEPSEEK_API_KEY="sk-deepseek")
+
+        assert settings.get_secret("DEEPSEEK_API_KEY") == "sk-deepseek"
+        assert settings.get_secret("GEMINI_API_KEY") is None
+
+    def test_secret_passed_to_provider_params(self):
+        """构建模型参数时使用密钥明文"""
+        settings = Settings(_env_file=None, LLM_PROVIDER="deepseek", DEEPSEEK_API_KEY="sk-deepseek")
+
+        assert settings.get_llm_params()["api_key"] == "sk-deepseek"
+
+    def test_settings_are_frozen(self):
+        """配置加载后只读"""
+        settings = Settings(_env_file=None)
+
+        with pytest.raises(ValidationError):
+            settings.OPENAI_API_KEY = "changed"
@@ -0,0 +1,259 @@
+"""
+装饰器单元测试
+
+专注于测试：
+- 响应缓存（按用户隔离、条件缓存、并发合并）
+- 速率限制
+- 进程内缓存后端
+- 异常处理
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import cache
+from app.core.cache import InMemoryBackend, set_cache_backend
+from app.core.decorators import cache_response, handle_exceptions, rate_limit
+from app.core.errors import NotFoundException, ValidationException
+from app.core.messages import MessageKeys
+
+
+@pytest.fixture(autouse=True)
+def memory_backend():
+    """每个测试使用独立的进程内缓存后端"""
+    backend = InMemoryBackend(maxsize=16)
+    set_cache_backend(backend)
+    yield backend
+    set_cache_backend(None)
+
+
+@pytest.mark.unit
+class TestCacheResponse:
+    """cache_response 测试"""
+
+    @pytest.mark.asyncio
+    async def test_second_call_hits_cache(self):
+        """相同参数的第二次调用直接返回缓存结果"""
+        calls = []
+
+        @cache_response(ttl=60)
+        async def endpoint(item_id: str):
+            calls.append(item_id)
+            return {"id": item_id}
+
+        # FastAPI以关键字方式调用端点
+        assert await endpoint(item_id="a") == {"id": "a"}
+        assert await endpoint(item_id="a") == {"id": "a"}
+        assert await endpoint(item_id="b") == {"id": "b"}
+        assert calls == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_cache_is_scoped_per_user(self):
+        """不同用户的缓存互相隔离"""
+        calls = []
+
+        @cache_response(ttl=60)
+        async def endpoint(current_user=None):
+            calls.append(current_user.id)
+            return current_user.id
+
+        alice = SimpleNamespace(id="alice")
+        bob = SimpleNamespace(id="bob")
+
+        assert await endpoint(current_user=alice) == "alice"
+        assert await endpoint(current_user=bob) == "bob"
+        assert await endpoint(current_user=alice) == "alice"
+        assert calls == ["alice", "bob"]
+
+    @pytest.mark.asyncio
+    async def test_condition_false_skips_cache(self):
+        """缓存条件不满足时不写入缓存"""
+        calls = []
+
+        @cache_response(ttl=60, condition=lambda result, *args, **kwargs: result is not None)
+        async def endpoint():
+            calls.append(1)
+            return None
+
+        await endpoint()
+        await endpoint()
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_run_once(self):
+        """同一键的并发未命中只执行一次被装饰函数"""
+        calls = []
+
+        @cache_response(ttl=60)
+        async def endpoint():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(endpoint() for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_share_exception(self, memory_backend):
+        """计算失败时等待者收到同一异常，且不写入缓存"""
+
+        @cache_response(ttl=60)
+        async def endpoint():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(endpoint() for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(memory_backend._data) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_fail_waiters(self):
+        """计算者被取消时，等待者自行重新计算而不是收到取消"""
+        calls = []
+        started = asyncio.Event()
+
+        @cache_response(ttl=60)
+        async def endpoint():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(0.01)
+            return "value"
+
+        leader = asyncio.create_task(endpoint())
+        await started.wait()
+        waiter = asyncio.create_task(endpoint())
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == "value"
+        assert leader.cancelled()
+        assert len(calls) == 2
+
+
+@pytest.mark.unit
+class TestRateLimit:
+    """rate_limit 测试"""
+
+    @pytest.mark.asyncio
+    async def test_rejects_after_burst(self):
+        """突发请求超过桶容量后返回429并带有 Retry-After"""
+
+        @rate_limit(max_requests=2, window_seconds=60)
+        async def endpoint(current_user=None):
+            return "ok"
+
+        user = SimpleNamespace(id="u1")
+        assert await endpoint(current_user=user) == "ok"
+        assert await endpoint(current_user=user) == "ok"
+
+        with pytest.raises(HTTPException) as exc_info:
+            await endpoint(current_user=user)
+
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+    @pytest.mark.asyncio
+    async def test_limits_each_user_separately(self):
+        """不同用户各自使用独立的令牌桶"""
+
+        @rate_limit(max_requests=1, window_seconds=60)
+        async def endpoint(current_user=None):
+            return current_user.id
+
+        assert await endpoint(current_user=SimpleNamespace(id="u1")) == "u1"
+        assert await endpoint(current_user=SimpleNamespace(id="u2")) == "u2"
+        with pytest.raises(HTTPException):
+            await endpoint(current_user=SimpleNamespace(id="u1"))
+
+
+@pytest.mark.unit
+class TestInMemoryBackend:
+    """InMemoryBackend 测试"""
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, monkeypatch):
+        """超过TTL的条目视为不存在"""
+        backend = InMemoryBackend()
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+
+        await backend.set("key", "value", ttl=10)
+        assert await backend.get("key") == "value"
+
+        now[0] += 10
+        assert await backend.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        """超出容量时淘汰最久未使用的条目"""
+        backend = InMemoryBackend(maxsize=2)
+        await backend.set("a", 1, ttl=60)
+        await backend.set("b", 2, ttl=60)
+        await backend.get("a")
+        await backend.set("c", 3, ttl=60)
+
+        assert await backend.get("a") == 1
+        assert await backend.get("b") is None
+        assert await backend.get("c") == 3
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_refills_over_time(self, monkeypatch):
+        """令牌按速率补充，耗尽时返回需要等待的秒数"""
+        backend = InMemoryBackend()
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+
+        assert await backend.take_token("k", capacity=1, refill_rate=0.5) == 0
+        assert await backend.take_token("k", capacity=1, refill_rate=0.5) == pytest.approx(2.0)
+
+        now[0] += 2
+        assert await backend.take_token("k", capacity=1, refill_rate=0.5) == 0
+
+
+@pytest.mark.unit
+class TestHandleExceptions:
+    """handle_exceptions 测试"""
+
+    @pytest.mark.asyncio
+    async def test_not_found_returns_404(self):
+        """未找到异常转换为404响应"""
+
+        @handle_exceptions()
+        async def endpoint():
+            raise NotFoundException("missing")
+
+        response = await endpoint()
+
+        assert response.code == 404
+        assert not response.success
+
+    @pytest.mark.asyncio
+    async def test_message_with_other_placeholder(self):
+        """消息模板含有 {error} 以外的占位符时仍返回错误响应"""
+
+        @handle_exceptions(not_found_message=MessageKeys.CONVERSATION_NOT_FOUND)
+        async def endpoint():
+            raise NotFoundException("missing")
+
+        response = await endpoint()
+
+        assert response.code == 404
+        assert "{conversation_id}" in response.message
+
+    @pytest.mark.asyncio
+    async def test_error_placeholder_is_filled(self):
+        """{error} 占位符填充异常信息"""
+
+        @handle_exceptions(validation_message=MessageKeys.KB_QUERY_FAILED)
+        async def endpoint():
+            raise ValidationException("bad field")
+
+        response = await endpoint()
+
+        assert response.code == 400
+        assert response.message.endswith("bad field")
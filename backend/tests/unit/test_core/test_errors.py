@@ -0,0 +1,91 @@
+"""
+异常处理器单元测试
+
+专注于测试：
+- 使用orjson序列化的错误响应
+"""
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, field_validator
+
+from app.core.errors import NotFoundException, OrjsonResponse, register_exception_handlers
+
+
+class Payload(BaseModel):
+    name: str
+
+    @field_validator("name")
+    @classmethod
+    def not_blank(cls, value):
+        if not value.strip():
+            raise ValueError("不能为空")
+        return value
+
+
+@pytest.mark.unit
+class TestOrjsonResponse:
+    """OrjsonResponse 测试"""
+
+    def test_render(self):
+        """UTC时间以Z结尾，非字符串键与无法序列化的值转为字符串"""
+        response = OrjsonResponse({
+            "timestamp": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "details": {1: ValueError("boom")},
+        })
+
+        assert response.body == b'{"timestamp":"2024-01-02T03:04:05Z","details":{"1":"boom"}}'
+        assert response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.unit
+class TestExceptionHandlers:
+    """注册后的异常处理器测试"""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        register_exception_handlers(app)
+
+        @app.get("/missing")
+        async def missing():
+            raise NotFoundException("对象不存在", resource_type="kb", resource_id="kb1")
+
+        @app.get("/forbidden")
+        async def forbidden():
+            raise HTTPException(status_code=403, detail="禁止访问")
+
+        @app.post("/items")
+        async def create(payload: Payload):
+            return payload
+
+        return TestClient(app)
+
+    def test_app_exception(self, client):
+        """业务异常返回统一结构，包含详情与请求路径"""
+        response = client.get("/missing")
+        body = response.json()
+
+        assert response.status_code == 404
+        assert body["success"] is False
+        assert body["message"] == "对象不存在"
+        assert body["details"] == {"resource_type": "kb", "resource_id": "kb1"}
+        assert body["path"] == "/missing"
+        assert body["timestamp"].endswith("Z")
+
+    def test_http_exception(self, client):
+        """HTTP异常保留状态码与说明"""
+        response = client.get("/forbidden")
+
+        assert response.status_code == 403
+        assert response.json()["message"] == "禁止访问"
+
+    def test_validation_error_with_exception_context(self, client):
+        """验证错误上下文中的异常对象被转为字符串"""
+        response = client.post("/items", json={"name": " "})
+        errors = response.json()["details"]["validation_errors"]
+
+        assert response.status_code == 400
+        assert errors[0]["ctx"]["error"] == "不能为空"
@@ -0,0 +1,65 @@
+"""
+日志工具单元测试
+
+专注于测试：
+- 敏感数据脱敏（无需脱敏时不复制）
+"""
+import pytest
+
+from app.core.logging import mask_sensitive_data
+
+
+@pytest.mark.unit
+class TestMaskSensitiveData:
+    """mask_sensitive_data 测试"""
+
+    def test_masks_sensitive_fields(self):
+        """敏感字段被替换，其余字段保持不变"""
+        data = {"username": "alice", "password": "p@ss", "API_KEY": "k"}
+
+        masked = mask_sensitive_data(data)
+
+        assert masked == {"username": "alice", "password": "***masked***", "API_KEY": "***masked***"}
+
+    def test_input_is_not_mutated(self):
+        """需要脱敏时返回副本，原始数据（包括嵌套字典）不被修改"""
+        nested = {"token": "t"}
+        data = {"user": "alice", "auth": nested}
+
+        masked = mask_sensitive_data(data)
+
+        assert masked["auth"] == {"token": "***masked***"}
+        assert masked is not data and masked["auth"] is not nested
+        assert nested == {"token": "t"}
+        assert data["auth"] is nested
+
+    def test_clean_data_is_returned_without_copy(self):
+        """没有需要脱敏的内容时原样返回，不复制"""
+        nested = {"name": "alice"}
+        data = {"user": nested, "count": 1, "note": "hello"}
+
+        masked = mask_sensitive_data(data)
+
+        assert masked is data
+        assert masked["user"] is nested
+
+    def test_untouched_nested_dict_is_shared(self):
+        """只复制包含敏感数据的那一层，未改动的嵌套字典直接复用"""
+        clean = {"name": "alice"}
+        data = {"profile": clean, "secret": "s"}
+
+        masked = mask_sensitive_data(data)
+
+        assert masked["secret"] == "***masked***"
+        assert masked["profile"] is clean
+
+    def test_masks_inline_string_values(self):
+        """字符串中的 key=value / "key": "value" 形式被脱敏"""
+        assert mask_sensitive_data('login token=abc123 ok') == 'login token=***masked*** ok'
+        assert "abc" not in mask_sensitive_data('{"password": "abc"}')
+
+    def test_custom_fields(self):
+        """指定字段列表时只脱敏这些字段"""
+        data = {"phone": "123", "password": "p"}
+
+        assert mask_sensitive_data(data, ["phone"]) == {"phone": "***masked***", "password": "p"}
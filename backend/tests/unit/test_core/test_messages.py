@@ -0,0 +1,113 @@
+"""
+消息管理单元测试
+
+专注于测试：
+- 按语言惰性加载
+- 消息文件修改后的后台重新加载
+- 点号键查找与格式化
+"""
+import json
+import os
+import time
+
+import pytest
+
+from app.core import messages as messages_module
+from app.core.messages import Language, MessageManager
+
+
+@pytest.mark.unit
+class TestMessageManager:
+    """MessageManager 测试"""
+
+    def test_languages_load_on_first_use(self):
+        """只加载实际使用的语言"""
+        manager = MessageManager()
+        assert all(messages is None for messages in manager.messages.values())
+
+        manager.get("common.success")
+
+        assert manager.messages[Language.ZH_CN.value] is not None
+        assert manager.messages[Language.EN_US.value] is None
+
+    def test_get_by_dotted_key(self):
+        """嵌套消息按点号键查找"""
+        manager = MessageManager()
+        assert manager.get("common.success") == "操作成功"
+        assert manager.get("common.success", Language.EN_US) != "common.success"
+
+    def test_missing_key_returns_key(self):
+        """未知键原样返回"""
+        assert MessageManager().get("no.such.key") == "no.such.key"
+
+    def test_format_with_kwargs(self):
+        """带参数的消息被格式化，不可哈希的参数同样可用"""
+        manager = MessageManager()
+        assert manager.get("knowledge.deleted", kb_id="kb1") == "知识库 kb1 已删除"
+        assert manager.get("knowledge.query_failed", error=["x"]) == "查询知识库失败: ['x']"
+
+    def test_missing_format_argument_returns_template(self):
+        """缺少格式化参数时返回原始模板"""
+        manager = MessageManager()
+        assert manager.get("knowledge.deleted", other="x") == "知识库 {kb_id} 已删除"
+
+
+@pytest.mark.unit
+class TestMessageReload:
+    """消息文件修改后的重新加载测试"""
+
+    @pytest.fixture
+    def messages_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(messages_module, "_RELOAD_CHECK_INTERVAL", 0)
+        self.write(tmp_path, "v1", mtime_ns=1_000_000_000)
+        return tmp_path
+
+    @staticmethod
+    def write(directory, text, mtime_ns):
+        path = directory / "zh_CN.json"
+        path.write_text(json.dumps({"common": {"success": text}}), encoding="utf-8")
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    @staticmethod
+    def wait_for(manager, expected, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while manager.get("common.success") != expected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return manager.get("common.success")
+
+    def test_serves_stale_then_reloads(self, messages_dir):
+        """文件修改后先返回旧消息，后台重新加载完成后返回新消息"""
+        manager = MessageManager(messages_dir=str(messages_dir))
+        assert manager.get("common.success") == "v1"
+
+        self.write(messages_dir, "v2", mtime_ns=2_000_000_000)
+
+        assert manager.get("common.success") == "v1"
+        assert self.wait_for(manager, "v2") == "v2"
+
+    def test_unchanged_file_is_not_reloaded(self, messages_dir, monkeypatch):
+        """修改时间未变时不重新读取文件"""
+        manager = MessageManager(messages_dir=str(messages_dir))
+        manager.get("common.success")
+        reads = []
+        monkeypatch.setattr(manager, "_read_messages", lambda language: reads.append(language) or {})
+
+        for _ in range(3):
+            assert manager.get("common.success") == "v1"
+        assert reads == []
+
+    def test_invalid_file_keeps_stale_messages(self, messages_dir):
+        """重新加载失败时保留旧消息"""
+        manager = MessageManager(messages_dir=str(messages_dir))
+        manager.get("common.success")
+
+        path = messages_dir / "zh_CN.json"
+        path.write_text("{not json", encoding="utf-8")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        manager.get("common.success")
+        deadline = time.monotonic() + 2.0
+        while manager._refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert not manager._refreshing
+        assert manager.get("common.success") == "v1"
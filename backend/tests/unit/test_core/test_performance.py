@@ -0,0 +1,89 @@
+"""
+性能监控单元测试
+
+专注于测试：
+- 慢请求与错误请求只取保留窗口内的数据
+- 整体指标的环形缓冲区聚合
+"""
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.core.performance import PerformanceMonitor, RequestMetrics
+
+
+def make_request(response_time: float, status_code: int = 200, path: str = "/api") -> RequestMetrics:
+    return RequestMetrics(
+        method="GET",
+        path=path,
+        status_code=status_code,
+        response_time=response_time,
+        memory_before=0.0,
+        memory_after=0.0,
+        ts_ns=time.time_ns(),
+    )
+
+
+@pytest.mark.unit
+class TestPerformanceMonitor:
+    """PerformanceMonitor 测试"""
+
+    def test_slow_requests_sorted_and_limited(self):
+        """慢请求按响应时间从慢到快返回，并受阈值与数量限制"""
+        monitor = PerformanceMonitor(max_history=10)
+        for response_time in (0.5, 3.0, 1.5, 2.0, 0.8):
+            monitor.record_request(make_request(response_time))
+
+        slow = monitor.get_slow_requests(threshold=1.0, limit=2)
+
+        assert [r.response_time for r in slow] == [3.0, 2.0]
+
+    def test_slow_requests_drop_out_of_window(self):
+        """超出保留窗口的慢请求不再返回"""
+        monitor = PerformanceMonitor(max_history=3)
+        monitor.record_request(make_request(5.0, path="/old"))
+        for _ in range(3):
+            monitor.record_request(make_request(1.2))
+
+        slow = monitor.get_slow_requests(threshold=1.0)
+
+        assert [r.path for r in slow] == ["/api"] * 3
+
+    def test_error_requests_newest_first_within_window(self):
+        """错误请求从新到旧返回，且只包含窗口内的请求"""
+        monitor = PerformanceMonitor(max_history=3)
+        monitor.record_request(make_request(0.1, 500, path="/old"))
+        monitor.record_request(make_request(0.1, 404, path="/a"))
+        monitor.record_request(make_request(0.1, 200))
+        monitor.record_request(make_request(0.1, 500, path="/b"))
+
+        errors = monitor.get_error_requests()
+
+        assert [r.path for r in errors] == ["/b", "/a"]
+
+    def test_overall_metrics_over_ring_buffer(self):
+        """整体指标只统计环形缓冲区中保留的请求"""
+        monitor = PerformanceMonitor(max_history=3)
+        for response_time, status_code in ((9.0, 500), (1.0, 200), (2.0, 404), (3.0, 200)):
+            monitor.record_request(make_request(response_time, status_code))
+
+        metrics = monitor.get_overall_metrics()
+
+        assert metrics.request_count == 3
+        assert metrics.total_response_time == pytest.approx(6.0)
+        assert metrics.max_response_time == 3.0
+        assert metrics.error_count == 1
+
+    def test_overall_metrics_time_window(self):
+        """按时间窗口过滤请求"""
+        monitor = PerformanceMonitor(max_history=10)
+        old = make_request(5.0)
+        old.ts_ns -= 120 * 10**9
+        monitor.record_request(old)
+        monitor.record_request(make_request(1.0))
+
+        metrics = monitor.get_overall_metrics(timedelta(seconds=60))
+
+        assert metrics.request_count == 1
+        assert metrics.max_response_time == 1.0
@@ -0,0 +1,63 @@
+"""
+权限检查单元测试
+
+专注于测试：
+- 知识库权限规则表
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.permissions import KnowledgeBasePermissionChecker
+from app.domain.models.knowledge_base import KnowledgeBaseType
+from app.domain.models.user import UserRole
+
+
+@pytest.mark.unit
+class TestKnowledgeBasePermissionChecker:
+    """KnowledgeBasePermissionChecker 测试"""
+
+    @pytest.fixture
+    def checker(self):
+        return KnowledgeBasePermissionChecker()
+
+    @pytest.fixture
+    def owner(self):
+        return SimpleNamespace(id="owner", role=UserRole.USER)
+
+    @pytest.fixture
+    def other(self):
+        return SimpleNamespace(id="other", role=UserRole.USER)
+
+    @pytest.fixture
+    def admin(self):
+        return SimpleNamespace(id="admin", role=UserRole.ADMIN)
+
+    @staticmethod
+    def make_kb(kb_type: KnowledgeBaseType):
+        return SimpleNamespace(kb_type=kb_type, owner_id="owner")
+
+    @pytest.mark.parametrize("kb_type, action, owner_allowed, other_allowed", [
+        (KnowledgeBaseType.PUBLIC, "read", True, True),
+        (KnowledgeBaseType.PERSONAL, "query", True, False),
+        (KnowledgeBaseType.SHARED, "access", True, False),
+        (KnowledgeBaseType.PUBLIC, "delete", True, False),
+        (KnowledgeBaseType.PERSONAL, "upload", True, False),
+        (KnowledgeBaseType.PERSONAL, "create", True, True),
+        (KnowledgeBaseType.PUBLIC, "unknown", False, False),
+    ])
+    def test_rules(self, checker, owner, other, kb_type, action, owner_allowed, other_allowed):
+        """普通用户按知识库类型与操作判定"""
+        kb = self.make_kb(kb_type)
+        assert checker.check_permission(owner, kb, action) is owner_allowed
+        assert checker.check_permission(other, kb, action) is other_allowed
+
+    def test_admin_allowed_everything(self, checker, admin):
+        """管理员拥有所有权限，包括未知操作"""
+        kb = self.make_kb(KnowledgeBaseType.PERSONAL)
+        assert checker.check_permission(admin, kb, "delete")
+        assert checker.check_permission(admin, kb, "unknown")
+
+    def test_anonymous_denied(self, checker):
+        """未登录用户没有任何权限"""
+        assert not checker.check_permission(None, self.make_kb(KnowledgeBaseType.PUBLIC), "read")
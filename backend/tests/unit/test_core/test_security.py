@@ -0,0 +1,63 @@
+"""
+安全模块单元测试
+
+专注于测试：
+- 已验证令牌缓存
+"""
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+from app.core import security
+from app.core.security import create_access_token, decode_token_cached
+
+
+@pytest.mark.unit
+class TestDecodeTokenCached:
+    """decode_token_cached 测试"""
+
+    @pytest.fixture(autouse=True)
+    def clear_token_cache(self):
+        security._token_cache.clear()
+        yield
+        security._token_cache.clear()
+
+    def test_valid_token_is_cached(self):
+        """有效令牌首次解码后写入缓存，再次解码直接命中"""
+        token = create_access_token("u1", "alice", "user")
+
+        first = decode_token_cached(token)
+        second = decode_token_cached(token)
+
+        assert first.user_id == "u1"
+        assert second is first
+        assert len(security._token_cache) == 1
+
+    def test_invalid_token_is_not_cached(self):
+        """签名无效的令牌返回None且不写入缓存"""
+        token = create_access_token("u1", "alice", "user") + "x"
+
+        assert decode_token_cached(token) is None
+        assert len(security._token_cache) == 0
+
+    def test_expired_cache_entry_is_evicted(self):
+        """缓存项按令牌自身的过期时间失效"""
+        token = create_access_token("u1", "alice", "user", expires_delta=timedelta(seconds=-1))
+        security._token_cache[security.xxhash.xxh3_128_intdigest(token.encode())] = (0, object())
+
+        assert decode_token_cached(token) is None
+        assert len(security._token_cache) == 0
+
+    def test_token_without_exp_is_not_cached(self):
+        """没有过期时间的令牌照常解码，但不写入缓存"""
+        token = jwt.encode(
+            {"sub": "u1", "username": "alice", "role": "user"},
+            security.settings.SECRET_KEY,
+            algorithm=security.settings.ALGORITHM,
+        )
+
+        token_data = decode_token_cached(token)
+
+        assert token_data.user_id == "u1"
+        assert len(security._token_cache) == 0
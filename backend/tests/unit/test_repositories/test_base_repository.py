@@ -0,0 +1,165 @@
+"""
+BaseRepository单元测试
+
+专注于测试：
+- 未注入会话时的读写连接池与会话生命周期
+- 批量创建、批量更新与分页
+使用内存或临时文件SQLite数据库
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from app.core import database as database_module
+from app.core import repository as repository_module
+from app.core.config import Settings
+from app.core.database import DatabaseManager
+from app.domain.models.mcp import MCPServer
+from app.repositories.mcp import MCPRepository
+
+
+@pytest.mark.unit
+class TestBaseRepositorySessionLifecycle:
+    """未注入会话时，读操作走只读连接池，且每次操作结束后归还连接"""
+
+    @pytest_asyncio.fixture
+    async def manager(self, tmp_path, monkeypatch):
+        settings = Settings(DATABASE_TYPE="sqlite", SQLITE_PATH=str(tmp_path / "test.db"))
+        monkeypatch.setattr(database_module, "get_settings", lambda: settings)
+        manager = DatabaseManager()
+        await manager.create_tables()
+        monkeypatch.setattr(repository_module, "db_manager", manager)
+        yield manager
+        await manager.close()
+
+    @staticmethod
+    def count_checkouts(engine):
+        checkouts = []
+        event.listen(engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+        return checkouts
+
+    @pytest.mark.asyncio
+    async def test_reads_use_read_only_pool(self, manager):
+        """读操作只使用只读连接池，写操作使用写连接池"""
+        repository = MCPRepository(None)
+        writes = self.count_checkouts(manager.engine)
+        reads = self.count_checkouts(manager.read_engine)
+
+        server = await repository.create({"name": "server", "user_id": "u1"})
+        assert len(writes) == 1 and not reads
+
+        assert (await repository.get_by_id(server.id)).name == "server"
+        assert [s.name for s in await repository.find_by(user_id="u1")] == ["server"]
+        assert await repository.count(user_id="u1") == 1
+        assert (await repository.paginate(page=1, size=10))["total"] == 1
+        assert len(await repository.search("serv", ["name"])) == 1
+        assert len(await repository.get_all()) == 1
+
+        assert len(writes) == 1
+        assert len(reads) == 6
+
+    @pytest.mark.asyncio
+    async def test_operations_release_connections(self, manager):
+        """操作结束后没有遗留的连接"""
+        repository = MCPRepository(None)
+        server = await repository.create({"name": "server", "user_id": "u1"})
+        await repository.update(server.id, {"name": "renamed"})
+
+        assert (await repository.get_by_id(server.id)).name == "renamed"
+        assert await repository.count() == 1
+
+        assert manager.engine.pool.checkedout() == 0
+        assert manager.read_engine.pool.checkedout() == 0
+
+
+@pytest.mark.unit
+class TestBaseRepositoryBulkOperations:
+    """批量操作与分页测试"""
+
+    @pytest.fixture
+    def repository(self, db_session):
+        return MCPRepository(db_session)
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_preserves_input_order(self, repository):
+        """列集合不同的行混合传入时，返回顺序与传入顺序一致"""
+        created = await repository.bulk_create([
+            {"name": "a", "user_id": "u1"},
+            {"name": "b", "user_id": "u1", "url": "http://b"},
+            {"name": "c", "user_id": "u1"},
+            {"name": "d", "user_id": "u1", "url": "http://d"},
+        ])
+
+        assert [server.name for server in created] == ["a", "b", "c", "d"]
+        assert [server.url for server in created] == [None, "http://b", None, "http://d"]
+        assert all(server.id and server.created_at for server in created)
+        assert await repository.count() == 4
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_mixed_dicts_and_instances(self, repository):
+        """字典与模型实例混合传入"""
+        created = await repository.bulk_create([
+            {"name": "dict", "user_id": "u1"},
+            MCPServer(name="instance", user_id="u1"),
+        ])
+
+        assert [server.name for server in created] == ["dict", "instance"]
+        assert await repository.count(user_id="u1") == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_returns_matched_rows(self, repository):
+        """返回实际更新的行数，不存在的ID不计入"""
+        created = await repository.bulk_create([
+            {"name": "a", "user_id": "u1"},
+            {"name": "b", "user_id": "u1"},
+        ])
+
+        updated = await repository.bulk_update([
+            {"id": created[0].id, "name": "a2"},
+            {"id": created[1].id, "name": "b2", "url": "http://b"},
+            {"id": "missing", "name": "x"},
+        ])
+
+        assert updated == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_refreshes_loaded_entities(self, repository):
+        """会话中已加载的实体在批量更新后反映新值"""
+        server = (await repository.bulk_create([{"name": "a", "user_id": "u1"}]))[0]
+
+        await repository.bulk_update([{"id": server.id, "name": "renamed"}])
+
+        assert server.name == "renamed"
+        assert (await repository.get_by_id(server.id)).name == "renamed"
+
+    @pytest.mark.asyncio
+    async def test_paginate_returns_total_with_page(self, repository):
+        """总数随分页数据一起返回，并应用过滤条件"""
+        await repository.bulk_create(
+            [{"name": f"s{i}", "user_id": "u1"} for i in range(5)]
+            + [{"name": "other", "user_id": "u2"}]
+        )
+
+        page = await repository.paginate(page=2, size=2, user_id="u1")
+
+        assert len(page["items"]) == 2
+        assert page["total"] == 5
+        assert page["pages"] == 3
+
+    @pytest.mark.asyncio
+    async def test_paginate_past_last_page_keeps_total(self, repository):
+        """页码超出范围时没有数据，但总数仍然正确"""
+        await repository.bulk_create([{"name": f"s{i}", "user_id": "u1"} for i in range(3)])
+
+        page = await repository.paginate(page=5, size=2)
+
+        assert page["items"] == []
+        assert page["total"] == 3
+        assert page["pages"] == 2
+
+    @pytest.mark.asyncio
+    async def test_paginate_empty_table(self, repository):
+        """空表分页"""
+        page = await repository.paginate()
+
+        assert page == {"items": [], "total": 0, "page": 1, "size": 10, "pages": 0}
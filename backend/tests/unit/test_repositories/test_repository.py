@@ -0,0 +1,74 @@
+"""
+通用Repository单元测试
+
+专注于测试：
+- 基于 lambda_stmt 的条件查询
+使用内存SQLite数据库
+"""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.core.database import Repository
+from app.domain.models.mcp import MCPServer
+
+
+@pytest.mark.unit
+class TestRepositoryFindBy:
+    """Repository.find_by 测试"""
+
+    @pytest_asyncio.fixture
+    async def repository(self, db_session):
+        repository = Repository(MCPServer, db_session)
+        await repository.bulk_create([
+            {"name": "with-url", "user_id": "u1", "url": "http://example.com"},
+            {"name": "no-url", "user_id": "u1"},
+            {"name": "other-user", "user_id": "u2"},
+        ])
+        return repository
+
+    @pytest.mark.asyncio
+    async def test_find_by_value(self, repository):
+        """等值条件"""
+        result = await repository.find_by(url="http://example.com")
+        assert [server.name for server in result] == ["with-url"]
+
+    @pytest.mark.asyncio
+    async def test_find_by_none_matches_null(self, repository):
+        """None 条件应生成 IS NULL，而不是绑定参数的等值比较"""
+        result = await repository.find_by(user_id="u1", url=None)
+        assert [server.name for server in result] == ["no-url"]
+
+    @pytest.mark.asyncio
+    async def test_find_by_reuses_cached_statement_with_new_values(self, repository):
+        """相同条件组合再次查询时使用新的参数值"""
+        assert len(await repository.find_by(user_id="u1")) == 2
+        assert len(await repository.find_by(user_id="u2")) == 1
+        assert await repository.find_by(user_id="missing") == []
+
+
+@pytest.mark.unit
+class TestRepositoryTimestamps:
+    """时间戳字段测试"""
+
+    @pytest.fixture
+    def non_utc_timezone(self, monkeypatch):
+        """切换到非UTC时区，暴露本地时间与数据库UTC时间混用的问题"""
+        monkeypatch.setenv("TZ", "Asia/Shanghai")
+        time.tzset()
+        yield
+        monkeypatch.undo()
+        time.tzset()
+
+    @pytest.mark.asyncio
+    async def test_updated_at_uses_same_clock_as_created_at(self, db_session, non_utc_timezone):
+        """更新时间与创建时间使用同一时钟，不会早于创建时间"""
+        repository = Repository(MCPServer, db_session)
+        server = await repository.create(name="server", user_id="u1")
+
+        updated = await repository.update(server.id, name="renamed")
+
+        assert updated.updated_at >= updated.created_at
+        assert abs(updated.updated_at - datetime.now()) < timedelta(minutes=1)
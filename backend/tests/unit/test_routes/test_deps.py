@@ -0,0 +1,80 @@
+"""
+API依赖单元测试
+
+专注于测试：
+- 认证依赖设置的当前用户上下文只在本次请求内有效
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_optional_current_user, get_user_service
+from app.core.context import current_user_var
+from app.core.security import create_access_token
+
+
+class FakeUserService:
+    async def get_user_by_username(self, username):
+        return SimpleNamespace(id="u1", username=username)
+
+
+@pytest.mark.unit
+class TestCurrentUserContext:
+    """current_user_var 生命周期测试"""
+
+    @pytest.fixture
+    def seen(self):
+        """记录端点内与请求处理结束后的上下文变量值"""
+        return {}
+
+    @pytest.fixture
+    def client(self, seen):
+        app = FastAPI()
+        app.dependency_overrides[get_user_service] = FakeUserService
+
+        @app.get("/required")
+        async def required(current_user=Depends(get_current_user)):
+            seen["inside"] = current_user_var.get()
+            return {"username": current_user.username}
+
+        @app.get("/optional")
+        async def optional(current_user=Depends(get_optional_current_user)):
+            seen["inside"] = current_user_var.get()
+            return {"username": current_user.username if current_user else None}
+
+        async def outer(scope, receive, send):
+            # 与路由处于同一任务：请求处理完成后上下文变量应已恢复
+            await app(scope, receive, send)
+            if scope["type"] == "http":
+                seen["after"] = current_user_var.get()
+
+        return TestClient(outer)
+
+    @pytest.fixture
+    def headers(self):
+        return {"Authorization": f"Bearer {create_access_token('u1', 'alice', 'user')}"}
+
+    def test_required_user_is_reset_after_request(self, client, seen, headers):
+        """get_current_user 在请求结束后恢复上下文变量"""
+        response = client.get("/required", headers=headers)
+
+        assert response.json() == {"username": "alice"}
+        assert seen["inside"].username == "alice"
+        assert seen["after"] is None
+
+    def test_optional_user_is_reset_after_request(self, client, seen, headers):
+        """get_optional_current_user 在请求结束后恢复上下文变量"""
+        response = client.get("/optional", headers=headers)
+
+        assert response.json() == {"username": "alice"}
+        assert seen["inside"].username == "alice"
+        assert seen["after"] is None
+
+    def test_optional_user_without_token(self, client, seen):
+        """未携带令牌时为匿名"""
+        response = client.get("/optional")
+
+        assert response.json() == {"username": None}
+        assert seen["inside"] is None